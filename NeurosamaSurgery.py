@@ -3,11 +3,15 @@ from __main__ import vtk, qt, ctk, slicer
 import slicer # type: ignore (slicer will be available in 3D Slicer)
 from slicer.ScriptedLoadableModule import * # type: ignore
 
-import os, sys
+import os, sys, re
+import importlib.util
 import numpy as np
 import json
 import threading
+import time
 import queue
+import collections
+import collections.abc
 
 try:
     import websocket
@@ -15,33 +19,99 @@ except ImportError:
     print('Warning: websocket-client is not installed. Please install it: slicer.util.pip_install("websocket-client")')
     websocket = None
 
+# Matches the command field of a message so that it can be read without parsing the whole message
+_COMMAND_RE = re.compile(rb'"command"\s*:\s*"([^"]+)"')
 
-class NeuroWebSocketHandler(qt.QObject): # type: ignore
-    """Handles WebSocket connection and Neuro API communication"""
+# orjson is optional; it is noticeably faster than the stdlib json module for the
+# per-frame parse/serialize work, so use it when it has been installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _jsonDefault(obj):
+    """Serialize read-only mappings (e.g. types.MappingProxyType action schemas) as objects"""
+    if isinstance(obj, collections.abc.Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj, default=_jsonDefault)
+
+    def _dumpsPretty(obj):
+        return orjson.dumps(obj, default=_jsonDefault, option=orjson.OPT_INDENT_2).decode()
+else:
+    def _loads(message):
+        # json.loads accepts str, bytes and bytearray but not memoryview
+        if isinstance(message, memoryview):
+            message = message.tobytes()
+        return json.loads(message)
+
+    def _dumps(obj):
+        return json.dumps(obj, default=_jsonDefault).encode()
+
+    def _dumpsPretty(obj):
+        return json.dumps(obj, default=_jsonDefault, indent=2)
+
+
+class EventList(list):
+    """List of callbacks that are all called when the event is emitted"""
+    
+    def __iadd__(self, callback):
+        self.append(callback)
+        return self
+    
+    def __isub__(self, callback):
+        self.remove(callback)
+        return self
     
-    # Signals
-    connected = qt.Signal()
-    disconnected = qt.Signal()
-    error = qt.Signal(str)
-    messageReceived = qt.Signal(object)
-    messageSent = qt.Signal(str, object)  # command, data
-    actionReceived = qt.Signal(str, str, str)  # actionId, actionName, actionParams
+    def emit(self, *args):
+        for callback in self:
+            callback(*args)
+    
+    __call__ = emit
+
+
+class NeuroWebSocketHandler:
+    """Handles WebSocket connection and Neuro API communication"""
     
     def __init__(self, gameName="Neurosama Surgery"):
-        super().__init__()
+        # Events. These are always emitted in the main thread (from the event queue timer)
+        # so plain Python callbacks are used rather than Qt signals
+        self.connected = EventList()
+        self.disconnected = EventList()
+        self.error = EventList()  # errorString
+        self.messageReceived = EventList()  # data, rawMessage (str for text frames, bytes for binary frames)
+        self.messageSent = EventList()  # messageJson
+        self.actionReceived = EventList()  # actionId, actionName, actionParams
+        
         self.ws = None
         self.gameName = gameName
+        # The game name never changes, so it is only serialized once
+        self._gameNameJson = _dumps(gameName)
+        # The start of a message only depends on its command, so it is serialized once per command
+        self._messagePrefixes = {
+            command: self._makeMessagePrefix(command)
+            for command in ("startup", "context", "action/result", "actions/register", "actions/unregister", "actions/force")
+        }
         self.wsThread = None
         self.isRunning = False
         self.url = None
+        # Whether received messages are being shown. If not, only actions need to be fully parsed
+        self.logVisible = False
         
         # Thread-safe queue for cross-thread communication
         self.eventQueue = queue.Queue()
         
-        # Timer to process events from websocket thread in main thread
+        # Timer to process events from websocket thread in main thread. It only runs
+        # while the websocket thread is alive so that it does not wake up the main
+        # thread every 10ms when there is no connection
         self.eventTimer = qt.QTimer()
+        self.eventTimer.setInterval(10)  # Process events every 10ms
         self.eventTimer.timeout.connect(self._processEventQueue)
-        self.eventTimer.start(10)  # Process events every 10ms
     
     def connect(self, url):
         """Connect to the WebSocket server"""
@@ -55,14 +125,14 @@ class NeuroWebSocketHandler(qt.QObject): # type: ignore
         # Start WebSocket in a separate thread
         self.wsThread = threading.Thread(target=self._runWebSocket, daemon=True)
         self.wsThread.start()
+        self.eventTimer.start()
     
     def disconnect(self):
         """Disconnect from the WebSocket server"""
         self.isRunning = False
         if self.ws:
             try:
-                # Stop the run_forever loop
-                self.ws.keep_running = False
+                # Closing stops the run_forever loop
                 self.ws.close()
             except Exception as e:
                 print(f"Error disconnecting WebSocket: {e}")
@@ -83,15 +153,21 @@ class NeuroWebSocketHandler(qt.QObject): # type: ignore
                 on_close=self._onClose
             )
             
-            # Run forever (blocking call)
-            self.ws.run_forever()
+            # Run forever (blocking call). Messages are validated when they are parsed as JSON,
+            # so websocket-client's own per-frame UTF-8 validation is skipped
+            self.ws.run_forever(skip_utf8_validation=True, ping_interval=30, ping_timeout=10)
             
         except Exception as e:
             print(f"WebSocket thread error: {e}")
-            self.error.emit(str(e))
+            # Queue event for main thread processing
+            self.eventQueue.put(("error", str(e)))
     
     def _processEventQueue(self):
         """Process events from the websocket thread (runs in main thread via QTimer)"""
+        # Checked before draining so that every event queued by a thread that has
+        # since exited is still processed before the timer is stopped
+        threadAlive = self.wsThread is not None and self.wsThread.is_alive()
+        
         try:
             while True:
                 # Non-blocking get - process all available events
@@ -104,17 +180,20 @@ class NeuroWebSocketHandler(qt.QObject): # type: ignore
                 elif eventType == "error":
                     self.error.emit(eventData)
                 elif eventType == "message":
-                    self.messageReceived.emit(eventData)
+                    data, rawMessage = eventData
+                    self.messageReceived.emit(data, rawMessage)
                 elif eventType == "action":
                     actionId, actionName, actionParams = eventData
                     self.actionReceived.emit(actionId, actionName, actionParams)
                 elif eventType == "messageSent":
-                    command, data = eventData
-                    self.messageSent.emit(command, data)
+                    self.messageSent.emit(eventData.decode())
                     
         except queue.Empty:
             # No more events to process
             pass
+        
+        if not threadAlive:
+            self.eventTimer.stop()
     
     def _onOpen(self, ws):
         """Called when WebSocket connection is established"""
@@ -140,13 +219,26 @@ class NeuroWebSocketHandler(qt.QObject): # type: ignore
     
     def _onMessage(self, ws, message):
         """Called when a message is received from the WebSocket"""
+        # Text frames arrive as str and binary frames as bytes. Both are parsed as they are
+        # without converting between the two, the raw log text is only decoded when shown
+        # Skip parsing messages whose contents will not be looked at
+        if not self.logVisible:
+            messageStart = message[:128]
+            if isinstance(messageStart, str):
+                messageStart = messageStart.encode()
+            commandMatch = _COMMAND_RE.search(messageStart)
+            if commandMatch and commandMatch.group(1) != b"action":
+                self.eventQueue.put(("message", (None, message)))
+                print(f"Unknown command: {commandMatch.group(1).decode()}")
+                return
+        
         try:
-            data = json.loads(message)
+            data = _loads(message)
             command = data.get("command")
             #print(f"Received message: {command}")
             
             # Queue event for main thread processing
-            self.eventQueue.put(("message", data))
+            self.eventQueue.put(("message", (data, message)))
             
             # Handle incoming messages based on command
             if command == "action":
@@ -157,11 +249,9 @@ class NeuroWebSocketHandler(qt.QObject): # type: ignore
         except json.JSONDecodeError as e:
             print(f"Failed to parse WebSocket message: {e}")
     
-    @qt.Slot(str, object)
-    def _emitMessageSent(self, command, data):
-        """Slot to emit messageSent signal in main thread"""
-        self.messageSent.emit(command, data)
-    
+    def _makeMessagePrefix(self, command):
+        """Serialize the command and game fields of a message"""
+        return b'{"command":' + _dumps(command) + b',"game":' + self._gameNameJson
     
     def _sendMessage(self, command, data=None):
         """Send a message to the WebSocket server"""
@@ -175,22 +265,19 @@ class NeuroWebSocketHandler(qt.QObject): # type: ignore
             print("Cannot send message: WebSocket not connected")
             return
         
-        message = {
-            "command": command,
-            "game": self.gameName
-        }
-        
+        # Splice the serialized fields together instead of building and serializing a wrapper dict
+        messageJson = self._messagePrefixes.get(command) or self._makeMessagePrefix(command)
         if data:
-            message["data"] = data
-        
-        messageJson = json.dumps(message)
+            messageJson += b',"data":' + _dumps(data)
+        messageJson += b'}'
         
         try:
-            self.ws.send(messageJson)
+            # Send the encoded bytes as a text frame so websocket-client does not re-encode them
+            self.ws.send(messageJson, opcode=websocket.ABNF.OPCODE_TEXT)
             print(f"Sent message: {command}")
             
             # Queue event for main thread processing
-            self.eventQueue.put(("messageSent", (command, data)))
+            self.eventQueue.put(("messageSent", messageJson))
         except Exception as e:
             print(f"Failed to send message: {e}")
     
@@ -248,9 +335,17 @@ class NeuroWebSocketHandler(qt.QObject): # type: ignore
         actionName = actionData.get("name")
         actionParams = actionData.get("data")
         
+        # Action data is sent as a JSON string, parse it here once rather than in the main thread.
+        # If it can't be parsed then the string is passed on so the procedure can report the problem
+        if isinstance(actionParams, (str, bytes)) and actionParams:
+            try:
+                actionParams = _loads(actionParams)
+            except json.JSONDecodeError as e:
+                print(f"Failed to parse action data: {e}")
+        
         #print(f"Action received: {actionName} (id: {actionId})")
         # Queue event for main thread processing
-        self.eventQueue.put(("action", (actionId, actionName, actionParams if actionParams else "")))
+        self.eventQueue.put(("action", (actionId, actionName, actionParams if actionParams else {})))
 
 
 class NeurosamaSurgery(ScriptedLoadableModule): # type: ignore
@@ -299,10 +394,18 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
             except:
                 pass
         
+        # Stop pending scene loads before reload
+        if hasattr(self, 'scenePrefetchTimer') and self.scenePrefetchTimer:
+            self.scenePrefetchTimer.stop()
+        
+        # Stop the log flush timer before reload
+        if hasattr(self, 'logFlushTimer') and self.logFlushTimer:
+            self.logFlushTimer.stop()
+        
         # Clean up WebSocket handler before reload
         if hasattr(self, 'websocketHandler') and self.websocketHandler:
             self.websocketHandler.disconnect()
-            self.websocketHandler.deleteLater()
+            self.websocketHandler.eventTimer.stop()
             self.websocketHandler = None
 
         globals()[moduleName] = slicer.util.reloadScriptedModule(moduleName)
@@ -316,14 +419,23 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         self.currentProcedure = None
         self.currentProcedureInstance = None
         
+        # Scene bundles are read on a worker thread before being loaded, this timer polls for it to finish
+        self.scenePrefetchThread = None
+        self.scenePrefetchPath = None
+        # Name of the procedure whose scene is being loaded, it is only set up once its scene has loaded
+        self.loadingProcedure = None
+        self.scenePrefetchTimer = qt.QTimer()
+        self.scenePrefetchTimer.setInterval(50)
+        self.scenePrefetchTimer.timeout.connect(self._onScenePrefetchPoll)
+        
         # Initialize WebSocket handler
         self.websocketHandler = NeuroWebSocketHandler("Neuro-Sama Surgery")
-        self.websocketHandler.connected.connect(self.onWebSocketConnected)
-        self.websocketHandler.disconnected.connect(self.onWebSocketDisconnected)
-        self.websocketHandler.error.connect(self.onWebSocketError)
-        self.websocketHandler.actionReceived.connect(self.onActionReceived)
-        self.websocketHandler.messageReceived.connect(self.onMessageReceived)
-        self.websocketHandler.messageSent.connect(self.logSentMessage)
+        self.websocketHandler.connected += self.onWebSocketConnected
+        self.websocketHandler.disconnected += self.onWebSocketDisconnected
+        self.websocketHandler.error += self.onWebSocketError
+        self.websocketHandler.actionReceived += self.onActionReceived
+        self.websocketHandler.messageReceived += self.onMessageReceived
+        self.websocketHandler.messageSent += self.logSentMessage
 
 
         # Banner image
@@ -402,6 +514,10 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         self.procedureUILayout = qt.QVBoxLayout(procedureUIButton)
         self.procedureUIGroupBox = procedureUIButton
         
+        # Procedure widgets are placed in a single container so that they can be cleared in one go
+        self.procedureContainer = None
+        self.clearProcedureUI()
+        
         # ===================================================================
         # =============================Debug Log=============================
         # Log section
@@ -425,6 +541,7 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         self.sentMessagesTextBox = qt.QPlainTextEdit()
         self.sentMessagesTextBox.readOnly = True
         self.sentMessagesTextBox.setMinimumHeight(200)
+        self.sentMessagesTextBox.document().setMaximumBlockCount(2000)
         sentLayout.addWidget(self.sentMessagesTextBox)
         
         logBoxesLayout.addLayout(sentLayout)
@@ -438,14 +555,38 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         self.receivedMessagesTextBox = qt.QPlainTextEdit()
         self.receivedMessagesTextBox.readOnly = True
         self.receivedMessagesTextBox.setMinimumHeight(200)
+        self.receivedMessagesTextBox.document().setMaximumBlockCount(2000)
         receivedLayout.addWidget(self.receivedMessagesTextBox)
         
         logBoxesLayout.addLayout(receivedLayout)
         
+        # Pretty print checkbox
+        self.prettyPrintCheckBox = qt.QCheckBox("Pretty print messages")
+        self.prettyPrintCheckBox.toolTip = "Reformat messages with indentation instead of logging them exactly as sent/received"
+        self.prettyPrintCheckBox.checked = False
+        logLayout.addWidget(self.prettyPrintCheckBox)
+        
         # Clear log button
         clearLogButton = qt.QPushButton("Clear Log")
         clearLogButton.clicked.connect(self.onClearLog)
         logLayout.addWidget(clearLogButton)
+        
+        # Received messages are only fully parsed when the log is visible
+        logLayoutButton.contentsCollapsed.connect(self.onLogCollapsed)
+        
+        # Log entries are buffered and appended in batches so that a high message rate
+        # does not trigger a text layout pass for every single message
+        self._sentBuf = []
+        self._recvBuf = []
+        self.logFlushTimer = qt.QTimer()
+        self.logFlushTimer.setInterval(100)
+        self.logFlushTimer.timeout.connect(self._flushLogs)
+        
+        # While the log is collapsed, the most recent messages are kept unformatted
+        # and only formatted once the log is expanded
+        self._logCollapsed = True
+        self._pendingSent = collections.deque(maxlen=500)
+        self._pendingRecv = collections.deque(maxlen=500)
         # ===================================================================
         
         self.layout.addStretch(1)
@@ -463,20 +604,19 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
             return
         
         # Find all subdirectories in Procedures folder
-        for item in os.listdir(proceduresDir):
-            itemPath = os.path.join(proceduresDir, item)
-            
+        for entry in os.scandir(proceduresDir):
             # Only process directories (skip files)
-            if os.path.isdir(itemPath) and not item.startswith("__"):
-                procedureName = item
+            if entry.is_dir() and not entry.name.startswith("__"):
+                procedureName = entry.name
+                itemPath = entry.path
             
             #try:
-                # Add the specific procedure directory to path
-                if itemPath not in sys.path:
-                    sys.path.insert(0, itemPath)
-                
-                # Try to import the module with the same name as the folder
-                module = __import__(procedureName)
+                # Import the module with the same name as the folder directly from its file
+                # rather than adding every procedure folder to sys.path
+                spec = importlib.util.spec_from_file_location(procedureName, os.path.join(itemPath, procedureName + ".py"))
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[procedureName] = module
+                spec.loader.exec_module(module)
                 
                 # Look for a class with the same name as the folder
                 if hasattr(module, procedureName):
@@ -520,6 +660,11 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
             print(f"Procedure class not found: {self.currentProcedure}")
             return
         
+        # The scene is loaded over several events, a second load can't start until the first has finished
+        if self.loadingProcedure:
+            print(f"Cannot load procedure: {self.loadingProcedure} is still loading")
+            return
+        
         print(f"Loading procedure: {self.currentProcedure}")
         
         # Cleanup previous procedure instance if it exists
@@ -528,6 +673,24 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
                 self.currentProcedureInstance.cleanup()
             except Exception as e:
                 print(f"Error cleaning up previous procedure: {e}")
+            self.currentProcedureInstance = None
+            self.clearProcedureUI()
+        
+        # Load the MRML scene for the procedure, the procedure is set up once the scene has been loaded
+        self.loadingProcedure = self.currentProcedure
+        if not self.loadProcedureScene():
+            self.setupLoadedProcedure()
+    
+    def setupLoadedProcedure(self):
+        """Instantiate the procedure that was being loaded and populate its UI"""
+        procedureName = self.loadingProcedure
+        self.loadingProcedure = None
+        
+        # Get the procedure class
+        procedureClass = self.procedureClasses.get(procedureName)
+        if not procedureClass:
+            print(f"Procedure class not found: {procedureName}")
+            return
         
         # Instantiate the procedure class
         try:
@@ -544,58 +707,101 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         if hasattr(self.currentProcedureInstance, 'createUI'):
             procedureWidgets = self.currentProcedureInstance.createUI()
             if procedureWidgets:
+                procedureContainerLayout = self.procedureContainer.layout()
                 for widget in procedureWidgets:
-                    self.procedureUILayout.addWidget(widget)
+                    procedureContainerLayout.addWidget(widget)
 
         
         # Expand the procedure UI group box
         self.procedureUIGroupBox.collapsed = False
         self.procedureUIGroupBox.text = f"Procedure: {self.currentProcedureInstance.__class__.__name__}"
-
-        # Load the MRML scene for the procedure
-        self.loadProcedureScene()
         
     
     def clearProcedureUI(self):
-        """Clear all widgets from the procedure UI layout"""
-        while self.procedureUILayout.count():
-            item = self.procedureUILayout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        """Clear all widgets from the procedure UI layout by replacing their container"""
+        if self.procedureContainer:
+            self.procedureContainer.deleteLater()
+        
+        self.procedureContainer = qt.QWidget()
+        procedureContainerLayout = qt.QVBoxLayout(self.procedureContainer)
+        procedureContainerLayout.setContentsMargins(0, 0, 0, 0)
+        self.procedureUILayout.addWidget(self.procedureContainer)
     
     def loadProcedureScene(self):
-        """Load the MRML scene bundle from the procedure's scene folder"""
-        if not self.currentProcedure:
+        """Start loading the MRML scene bundle from the loading procedure's scene folder.
+        
+        Returns True if a scene load was started, setupLoadedProcedure is called once it has finished
+        """
+        if not self.loadingProcedure:
             print("No procedure selected")
-            return
+            return False
         
         # Get the module directory and procedure scene directory
-        procedureDir = os.path.join(self.moduleDir, "Procedures", self.currentProcedure)
+        procedureDir = os.path.join(self.moduleDir, "Procedures", self.loadingProcedure)
         sceneDir = os.path.join(procedureDir, "scene")
         
         if not os.path.exists(sceneDir):
             print(f"Scene directory not found: {sceneDir}")
-            return
+            return False
         
         mrbFiles = [f for f in os.listdir(sceneDir) if f.endswith('.mrb')]
         
         if not mrbFiles:
             print(f"No .mrb files found in: {sceneDir}")
-            return
+            return False
         
         # Load the first .mrb file found
         mrbPath = os.path.join(sceneDir, mrbFiles[0])
         
+        print(f"Loading scene bundle: {mrbPath}")
+        slicer.util.showStatusMessage(f"Loading scene bundle: {mrbFiles[0]}...")
+        
+        # Read the bundle from disk on a worker thread first so that the UI stays responsive
+        # while it is read and the blocking load afterwards is served from the OS file cache
+        self.scenePrefetchPath = mrbPath
+        self.scenePrefetchThread = threading.Thread(target=self._prefetchSceneFile, args=(mrbPath,), daemon=True)
+        self.scenePrefetchThread.start()
+        self.scenePrefetchTimer.start()
+        return True
+    
+    def _prefetchSceneFile(self, mrbPath):
+        """Read a scene bundle from disk (runs in a worker thread)"""
+        try:
+            with open(mrbPath, "rb") as mrbFile:
+                while mrbFile.read(1024 * 1024):
+                    pass
+        except OSError as e:
+            print(f"Error reading scene bundle: {e}")
+    
+    def _onScenePrefetchPoll(self):
+        """Clear the scene once the scene bundle has been read (runs in main thread via QTimer)"""
+        if self.scenePrefetchThread and self.scenePrefetchThread.is_alive():
+            return
+        self.scenePrefetchTimer.stop()
+        
+        mrbPath = self.scenePrefetchPath
         try:
-            print(f"Loading scene bundle: {mrbPath}")
             # Clear the current scene first
             slicer.mrmlScene.Clear(0)
+        except Exception as e:
+            print(f"Error clearing scene: {e}")
+            self.setupLoadedProcedure()
+            return
+        
+        # Load in a separate event so the cleared scene is painted before the load blocks
+        qt.QTimer.singleShot(0, lambda: self._finishLoadScene(mrbPath))
+    
+    def _finishLoadScene(self, mrbPath):
+        """Load a scene bundle that has been read from disk"""
+        try:
             # Load the scene bundle
             slicer.util.loadScene(mrbPath)
-            print(f"Scene bundle loaded successfully: {mrbFiles[0]}")
+            print(f"Scene bundle loaded successfully: {os.path.basename(mrbPath)}")
         except Exception as e:
             print(f"Error loading scene bundle: {e}")
+        slicer.util.showStatusMessage("")
+        
+        self.setupLoadedProcedure()
     
     def onConnectionToggle(self, checked):
         """Handle WebSocket connection toggle"""
@@ -616,6 +822,8 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         
         # Enable procedure loading when connected
         self.loadProcedureButton.enabled = True
+        
+        self.logFlushTimer.start()
     
     def onWebSocketDisconnected(self):
         self.websocketConnectionStatusLabel.text = "Disconnected"
@@ -626,6 +834,9 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         
         # Disable procedure loading when disconnected
         self.loadProcedureButton.enabled = False
+        
+        self.logFlushTimer.stop()
+        self._flushLogs()
     
     def onWebSocketError(self, errorString):
         """Called when WebSocket encounters an error"""
@@ -637,33 +848,75 @@ class NeurosamaSurgeryWidget(ScriptedLoadableModuleWidget): # type: ignore
         print(f"Widget received action: {actionName} (id: {actionId})")
         
         if self.currentProcedureInstance:
-           actionResult, message = self.currentProcedureInstance.onActionReceived(actionId, actionName, actionParams)
+            actionResult, message = self.currentProcedureInstance.onActionReceived(actionId, actionName, actionParams)
         else:
             print("No procedure instance found")
+            actionResult, message = False, "No procedure has been loaded."
         self.websocketHandler.sendActionResult(actionId, actionResult, message)
     
-    def onMessageReceived(self, data):
+    def onMessageReceived(self, data, rawMessage):
         """Called when a message is received from Neuro"""
-        messageJson = json.dumps(data, indent=2)
-        timestamp = qt.QDateTime.currentDateTime().toString("hh:mm:ss")
-        logEntry = f"[{timestamp}]\n{messageJson}\n\n"
-        self.receivedMessagesTextBox.appendPlainText(logEntry)
+        timestamp = time.strftime("%H:%M:%S")
+        if self._logCollapsed:
+            self._pendingRecv.append((timestamp, data, rawMessage))
+            return
+        self._recvBuf.append(self._formatReceivedLogEntry(timestamp, data, rawMessage))
     
-    def logSentMessage(self, command, data=None):
+    def logSentMessage(self, messageJson):
         """Log a message sent to Neuro"""
-        message = {
-            "command": command,
-            "game": self.websocketHandler.gameName
-        }
-        if data:
-            message["data"] = data
-        
-        messageJson = json.dumps(message, indent=2)
-        timestamp = qt.QDateTime.currentDateTime().toString("hh:mm:ss")
-        logEntry = f"[{timestamp}]\n{messageJson}\n\n"
-        self.sentMessagesTextBox.appendPlainText(logEntry)
+        timestamp = time.strftime("%H:%M:%S")
+        if self._logCollapsed:
+            self._pendingSent.append((timestamp, messageJson))
+            return
+        self._sentBuf.append(self._formatSentLogEntry(timestamp, messageJson))
+    
+    def _formatReceivedLogEntry(self, timestamp, data, rawMessage):
+        """Format a received message for the log"""
+        # Log the message as received unless it has been asked to be pretty printed
+        if self.prettyPrintCheckBox.checked and data is not None:
+            messageJson = _dumpsPretty(data)
+        elif isinstance(rawMessage, str):
+            messageJson = rawMessage
+        else:
+            messageJson = bytes(rawMessage).decode("utf-8", errors="replace")
+        return f"[{timestamp}]\n{messageJson}\n\n"
+    
+    def _formatSentLogEntry(self, timestamp, messageJson):
+        """Format a sent message for the log"""
+        # The message is logged exactly as it was sent unless it has been asked to be pretty printed
+        if self.prettyPrintCheckBox.checked:
+            messageJson = _dumpsPretty(_loads(messageJson))
+        return f"[{timestamp}]\n{messageJson}\n\n"
+    
+    def onLogCollapsed(self, collapsed):
+        """Called when the debug log is collapsed or expanded"""
+        self._logCollapsed = collapsed
+        self.websocketHandler.logVisible = not collapsed
+        
+        if not collapsed:
+            # Format the messages that were held back while the log was collapsed
+            for timestamp, messageJson in self._pendingSent:
+                self._sentBuf.append(self._formatSentLogEntry(timestamp, messageJson))
+            for timestamp, data, rawMessage in self._pendingRecv:
+                self._recvBuf.append(self._formatReceivedLogEntry(timestamp, data, rawMessage))
+            self._pendingSent.clear()
+            self._pendingRecv.clear()
+            self._flushLogs()
+    
+    def _flushLogs(self):
+        """Append any buffered log entries to the message log boxes"""
+        if self._sentBuf:
+            self.sentMessagesTextBox.appendPlainText("".join(self._sentBuf))
+            self._sentBuf.clear()
+        if self._recvBuf:
+            self.receivedMessagesTextBox.appendPlainText("".join(self._recvBuf))
+            self._recvBuf.clear()
     
     def onClearLog(self):
         """Clear both message log boxes"""
+        self._sentBuf.clear()
+        self._recvBuf.clear()
+        self._pendingSent.clear()
+        self._pendingRecv.clear()
         self.sentMessagesTextBox.clear()
         self.receivedMessagesTextBox.clear()
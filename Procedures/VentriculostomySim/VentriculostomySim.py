@@ -2,9 +2,278 @@
 from __main__ import vtk, qt, ctk, slicer
 import slicer # type: ignore (slicer will be available in 3D Slicer)
 import json
+import logging
+import math
+import sys
+import time
+import numpy as np
+from types import MappingProxyType
+
+# Numba is optional (it isn't bundled with Slicer), without it the path kernel just runs as regular Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Per-action/per-phase diagnostics are logged at debug level, the host application decides whether they are shown
+logger = logging.getLogger(__name__)
+
+# Read-only action schemas. They are shared between actions and never rebuilt
+_DRILL_SITE_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": MappingProxyType({
+        "location": MappingProxyType({"type": "string", "enum": ("kochers_point_left", "kochers_point_right", "glabella", "nasion", "pterion_left", "pterion_right", "bregma", "maccartys_keyhole_left", "maccartys_keyhole_right", "keens_point_left", "keens_point_right")}),
+    }),
+    "required": ("location",)
+})
+
+_CATHETER_DISTANCE_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": MappingProxyType({
+        "distance": MappingProxyType({"type": "number", "minimum": 1, "maximum": 100}),
+    }),
+    "required": ("distance",)
+})
+
+_EMPTY_SCHEMA = MappingProxyType({})
+
+# Actions registered with Neuro during each phase. These never change, so they are built once
+_CRANIAL_ACCESS_ACTIONS = (
+    {
+        "name": "move_to_drill_site",
+        "description": "Move the drill to a location on the head.",
+        "schema": _DRILL_SITE_SCHEMA
+    },
+    # {
+    #     "name": "make_incision",
+    #     "description": "Make an incision on the head to prepare to start drilling.",
+    #     "schema": {
+    #     }
+    # },
+    {
+        "name": "drill_hole",
+        "description": "Start drilling into the skull. Doing this will move you to the next phase of the procedure.",
+        "schema": _EMPTY_SCHEMA
+    },                
+)
+
+_CATHETER_PLACEMENT_ACTIONS = (
+    {
+        "name": "insert_catheter",
+        "description": "Insert the catheter by some distance. We want the catheter to reach the ventricles to drain them. Distance should be in mm.",
+        "schema": _CATHETER_DISTANCE_SCHEMA
+    },
+    {
+        "name": "retract_catheter",
+        "description": "Retract the catheter by some distance. We want the catheter to reach the ventricles to drain them. Distance should be in mm.",
+        "schema": _CATHETER_DISTANCE_SCHEMA
+    },
+    {
+        "name": "start_draining",
+        "description": "Start draining the ventricles of fluid.",
+        "schema": _EMPTY_SCHEMA
+    },
+)
+
+_PHASE_ACTIONS = {
+    "cranial_access": _CRANIAL_ACCESS_ACTIONS,
+    "catheter_placement": _CATHETER_PLACEMENT_ACTIONS,
+}
+
+# Names of the actions registered during each phase, used to unregister them when leaving the phase
+_PHASE_ACTION_NAMES = {phaseKey: tuple(action["name"] for action in actions) for phaseKey, actions in _PHASE_ACTIONS.items()}
+
+
+def _make_unit_trajectory_poly():
+    """Build the trajectory cylinder with unit length, its base at the origin and pointing along +Z"""
+    cylinderSource = vtk.vtkCylinderSource()
+    cylinderSource.SetHeight(1.0)
+    cylinderSource.SetRadius(3.0)  # 1mm radius for visibility
+    cylinderSource.SetResolution(20)
+    
+    # The cylinder is created along Y-axis by default, we need it along Z-axis
+    # Create a transform to rotate it 90 degrees around X to align with Z
+    # Then translate it so the origin is at one end (the base)
+    transform = vtk.vtkTransform()
+    transform.Translate(0, 0, 0.5)  # Move origin to the base of the cylinder
+    transform.RotateX(90)
+    
+    transformFilter = vtk.vtkTransformPolyDataFilter()
+    transformFilter.SetInputConnection(cylinderSource.GetOutputPort())
+    transformFilter.SetTransform(transform)
+    transformFilter.Update()
+
+    # Copy the output so the polydata doesn't keep the pipeline alive
+    unitTrajectoryPoly = vtk.vtkPolyData()
+    unitTrajectoryPoly.DeepCopy(transformFilter.GetOutput())
+    return unitTrajectoryPoly
+
+
+# Built once, the trajectory model's length is only ever changed through a scale transform
+_UNIT_TRAJECTORY_POLY = _make_unit_trajectory_poly()
+
+
+@njit(cache=True, fastmath=True)
+def _normalized(v):
+    """Return v scaled to unit length, or a zero vector if v has (almost) no length"""
+    magnitudeSq = np.sum(v * v)
+    if magnitudeSq > 1e-24:
+        # One division, then multiplying each component is cheaper than dividing each component
+        return v * (1.0 / np.sqrt(magnitudeSq))
+    return np.zeros(3)
+
+
+@njit(cache=True, fastmath=True)
+def _compute_safety_waypoints(currentPos, targetPos, safetyZoneCenter, safetyZoneRadius, skullCenter):
+    """Compute the retract, arc and approach waypoints from currentPos to targetPos around the safety zone.
+    
+    All positions are float64 arrays of length 3 and the math is done with NumPy array operations.
+    Returns a (K, 3) array of waypoints, not including currentPos
+    """
+    numArcPoints = 3
+    waypoints = np.empty((numArcPoints + 2, 3))
+    count = 0
+
+    # Distances are compared squared so the common case (outside the zone, clear line) doesn't take any square roots
+    safetyZoneRadiusSq = safetyZoneRadius * safetyZoneRadius
+
+    # SEGMENT 1: Retract away from skull if currently inside safety zone
+    distFromSafetyZoneSq = np.sum((currentPos - safetyZoneCenter) ** 2)
+    startPos = currentPos.copy()
+
+    if distFromSafetyZoneSq < safetyZoneRadiusSq:
+        distFromSafetyZone = np.sqrt(distFromSafetyZoneSq)
+
+        # Direction away from skull (from skull center to current position)
+        retractDirection = currentPos - skullCenter
+        retractMagnitude = np.sqrt(np.sum(retractDirection ** 2))
+
+        # Move along the retract direction until we're outside the safety zone, +10mm extra clearance
+        retractDistance = safetyZoneRadius - distFromSafetyZone + 10.0
+        if retractMagnitude > 0:
+            startPos = currentPos + retractDirection * (retractDistance / retractMagnitude)
+        waypoints[count] = startPos
+        count += 1
+
+    # SEGMENT 2: Arc around the safety zone if a straight line from startPos to targetPos intersects it
+    dirToTarget = targetPos - startPos
+    distToTargetSq = np.sum(dirToTarget ** 2)
+
+    if distToTargetSq > 0:
+        # Find the closest point on the line segment to the safety zone center using vector projection,
+        # with the projection factor clamped to the segment
+        projection = np.sum((safetyZoneCenter - startPos) * dirToTarget) / distToTargetSq
+        projection = max(0.0, min(projection, 1.0))
+        closestPointOnLine = startPos + dirToTarget * projection
+        distFromLineToCenterSq = np.sum((closestPointOnLine - safetyZoneCenter) ** 2)
+
+        # If the straight line to the target stays outside the safety zone we go directly to the target
+        if distFromLineToCenterSq < safetyZoneRadiusSq:
+            # Directions from the safety zone center to the start and to the target
+            startDir = _normalized(startPos - safetyZoneCenter)
+            centerToTarget = _normalized(targetPos - safetyZoneCenter)
+
+            # Interpolation factors for all the arc waypoints
+            t = np.arange(1, numArcPoints + 1) / (numArcPoints + 1)
+
+            # Spherical interpolation between start and target directions, so the waypoints are evenly spaced along the arc
+            cosTheta = np.sum(startDir * centerToTarget)
+            if cosTheta > 1.0 - 1e-8:
+                # The directions are (almost) the same, linear interpolation is accurate enough and avoids dividing by ~0
+                interpDirs = np.outer(1 - t, startDir) + np.outer(t, centerToTarget)
+                interpMagnitudes = np.sqrt(np.sum(interpDirs ** 2, axis=1))
+                interpDirs = interpDirs / np.where(interpMagnitudes > 0, interpMagnitudes, 1.0).reshape(numArcPoints, 1)
+            elif cosTheta < -1.0 + 1e-8:
+                # The directions are (almost) opposite so the arc plane is undefined, rotate half way around
+                # through a direction perpendicular to startDir, made from the axis it is least aligned with
+                axis = np.zeros(3)
+                axis[np.argmin(np.abs(startDir))] = 1.0
+                perpendicularDir = _normalized(np.cross(startDir, axis))
+                interpDirs = np.outer(np.cos(t * np.pi), startDir) + np.outer(np.sin(t * np.pi), perpendicularDir)
+            else:
+                theta = np.arccos(min(max(cosTheta, -1.0), 1.0))
+                sinTheta = np.sin(theta)
+                interpDirs = np.outer(np.sin((1 - t) * theta) / sinTheta, startDir) + np.outer(np.sin(t * theta) / sinTheta, centerToTarget)
+
+            # Place the waypoints at the radius +5mm clearance
+            waypoints[count:count + numArcPoints] = safetyZoneCenter + interpDirs * (safetyZoneRadius + 5.0)
+            count += numArcPoints
+
+    # SEGMENT 3: Approach - move to the final target position
+    waypoints[count] = targetPos
+    count += 1
+
+    return waypoints[:count]
+
+
+def _slerp_quaternions(startQuat, targetQuat, progress):
+    """Spherical linear interpolation between two unit (w, x, y, z) quaternions at each of the progress values.
+    
+    Returns an (N, 4) array of unit quaternions, taking the shorter way around
+    """
+    # Negate the target if needed so we rotate the short way around
+    cosHalfTheta = float(np.dot(startQuat, targetQuat))
+    if cosHalfTheta < 0:
+        targetQuat = -targetQuat
+        cosHalfTheta = -cosHalfTheta
+    sinHalfTheta = math.sqrt(max(0.0, 1.0 - cosHalfTheta * cosHalfTheta))
+    
+    if sinHalfTheta < 1e-4:
+        # The orientations are (almost) the same, normalized linear interpolation avoids dividing by ~0
+        quats = np.outer(1.0 - progress, startQuat) + np.outer(progress, targetQuat)
+        return quats / np.linalg.norm(quats, axis=1, keepdims=True)
+    
+    halfTheta = math.atan2(sinHalfTheta, cosHalfTheta)
+    ratioA = np.sin((1.0 - progress) * halfTheta) / sinHalfTheta
+    ratioB = np.sin(progress * halfTheta) / sinHalfTheta
+    return np.outer(ratioA, startQuat) + np.outer(ratioB, targetQuat)
+
+
+def _quaternions_to_matrices(quats):
+    """Convert an (N, 4) array of unit (w, x, y, z) quaternions to an (N, 3, 3) array of rotation matrices"""
+    w, x, y, z = quats[:, 0], quats[:, 1], quats[:, 2], quats[:, 3]
+    matrices = np.empty((len(quats), 3, 3))
+    matrices[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    matrices[:, 0, 1] = 2.0 * (x * y - w * z)
+    matrices[:, 0, 2] = 2.0 * (x * z + w * y)
+    matrices[:, 1, 0] = 2.0 * (x * y + w * z)
+    matrices[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    matrices[:, 1, 2] = 2.0 * (y * z - w * x)
+    matrices[:, 2, 0] = 2.0 * (x * z - w * y)
+    matrices[:, 2, 1] = 2.0 * (y * z + w * x)
+    matrices[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return matrices
+
 
 class VentriculostomySim:
     """Example procedure for ventriculostomy"""
+
+    # Every instance attribute is declared here, new attributes need to be added to this list
+    __slots__ = (
+        "name", "description", "websocketHandler", "moving", "selectedVentriclePosition",
+        "_selectedVentriclePositionArr",
+        "_nodes", "_nodeRemovedObserver", "_drillSiteCache", "_ventricleCache",
+        "_safetyZoneGeom", "_skullGeom", "_moveLocation", "_lastMove", "_trajectoryScaleTransform",
+        "_collisionDetection", "_trajectoryWorldMatrix", "_vesselsWorldMatrix",
+        # UI
+        "phaseLabel", "phaseDescriptionLabel", "nextPhaseButton",
+        # Path movement animation
+        "_tickTimer", "_activeMovement", "_toolTransformNode", "_intendedToolTransformNode",
+        "_toolMatrix", "_scratchMatrix",
+        "movementStartTime", "movementTotalDistance", "movementSpeed", "currentPathCurve",
+        "startOrientation", "targetOrientation", "_pathPoses", "_pathSampleSpacing",
+        # Catheter movement animation
+        "catheterStartTime", "catheterTotalDistance", "catheterSpeed", "catheterDirection",
+        "catheterStartPosition", "catheterMovementType", "_catheterPose",
+        # Phases and actions
+        "currentPhase", "phases", "_phaseOrder", "_phaseIndex", "_phaseNames", "_phaseDescs",
+        "_phaseName", "_phaseDescription", "_currentActions", "_actionHandlers",
+        # Allows weak references to bound methods connected to Qt signals
+        "__weakref__",
+    )
     
     def __init__(self):
         self.name = "Ventriculostomy"
@@ -12,33 +281,77 @@ class VentriculostomySim:
         self.websocketHandler = None
         self.moving = False
 
+        # UI widgets (created in createUI)
+        self.phaseLabel = None
+        self.phaseDescriptionLabel = None
+        self.nextPhaseButton = None
+
         self.selectedVentriclePosition = None
+        self._selectedVentriclePositionArr = None  # selectedVentriclePosition as a float64 array
+
+        # Scene nodes looked up by name. The lookups are dropped whenever a node is removed from the scene
+        self._nodes = {}
+        self._nodeRemovedObserver = slicer.mrmlScene.AddObserver(slicer.vtkMRMLScene.NodeRemovedEvent, self.onNodeRemoved)
+
+        # Fiducial positions read from the scene, as (node, node MTime, positions)
+        self._drillSiteCache = None
+        self._ventricleCache = None
+
+        # Safety zone (center, radius) and skull center read from the model bounds, as (polydata, polydata MTime, geometry)
+        self._safetyZoneGeom = None
+        self._skullGeom = None
+
+        # Transform that scales the unit trajectory cylinder to the distance to the ventricle
+        self._trajectoryScaleTransform = None
+
+        # Trajectory/vessel collision filter. It is kept so the vessel OBB tree is only rebuilt when the vessels change
+        self._collisionDetection = None
+        self._trajectoryWorldMatrix = None
+        self._vesselsWorldMatrix = None
+        
+        # Drill site being moved to, and (move state key, drill site report) for the last drill site we arrived at
+        self._moveLocation = None
+        self._lastMove = None
+        
+        # One timer drives whichever movement animation is active (update every 50ms for smooth animation)
+        self._activeMovement = None
+        self._tickTimer = qt.QTimer()
+        self._tickTimer.setInterval(50)  # 50ms = 20 FPS
+        self._tickTimer.timeout.connect(self.onTick)
+
+        # Transform nodes used by the active movement, looked up once when the movement starts
+        self._toolTransformNode = None
+        self._intendedToolTransformNode = None
+
+        # Matrices reused by the movements instead of allocating new ones on every timer tick
+        self._toolMatrix = vtk.vtkMatrix4x4()
+        self._scratchMatrix = vtk.vtkMatrix4x4()
         
         # Movement animation variables
-        self.movementTimer = None
         self.movementStartTime = None
         self.movementTotalDistance = 0.0
         self.movementSpeed = 20.0  # mm per second
         self.currentPathCurve = None
         self.startOrientation = None  # Starting orientation quaternion
         self.targetOrientation = None  # Target orientation quaternion
+        self._pathPoses = None  # Tool transform matrix for each timer tick of the movement, (N, 4, 4)
+        self._pathSampleSpacing = 1.0  # Distance along the path between the poses
         
         # Catheter movement animation variables
-        self.catheterTimer = None
         self.catheterStartTime = None
         self.catheterTotalDistance = 0.0
         self.catheterSpeed = 10.0  # mm per second
         self.catheterDirection = [0.0, 0.0, 0.0]  # Direction vector for catheter movement
         self.catheterStartPosition = [0.0, 0.0, 0.0]  # Starting position
         self.catheterMovementType = ""  # "insert" or "retract"
+        self._catheterPose = None  # Tool transform matrix at the start of the movement, (4, 4)
         
         # Define phases and their available actions
         self.currentPhase = "startup"
         self.phases = {
             "startup": {
                 "name": "Startup",
-                "description": "The procedure has not yet started",
-                "actions": []
+                "description": "The procedure has not yet started"
             },
             # "preparation": {
             #     "name": "Preparation",
@@ -47,13 +360,11 @@ class VentriculostomySim:
             # },
             "cranial_access": {
                 "name": "Cranial Access",
-                "description": "We need to drill a burr hole for catheter access into the brain",
-                "actions": ["move_to_drill_site", "drill_hole"]
+                "description": "We need to drill a burr hole for catheter access into the brain"
             },
             "catheter_placement": {
                 "name": "Catheter Placement",
-                "description": "Inserting the catheter",
-                "actions": ["insert_catheter", "verify_placement", "secure_catheter"]
+                "description": "Inserting the catheter"
             },
             # "completion": {
             #     "name": "Completion",
@@ -62,43 +373,114 @@ class VentriculostomySim:
             # }
         }
 
+        # Phase order, the position of each phase in it and the display text of each phase in that order
+        self._phaseOrder = list(self.phases)
+        self._phaseIndex = {phaseKey: index for index, phaseKey in enumerate(self._phaseOrder)}
+        self._phaseNames = tuple(phase["name"] for phase in self.phases.values())
+        self._phaseDescs = tuple(phase["description"] for phase in self.phases.values())
+
+        # Display text and registered action names of the current phase
+        currentIndex = self._phaseIndex[self.currentPhase]
+        self._phaseName = self._phaseNames[currentIndex]
+        self._phaseDescription = self._phaseDescs[currentIndex]
+        self._currentActions = _PHASE_ACTION_NAMES.get(self.currentPhase, ())
+
+        # Action handlers keyed by (phase, action name)
+        self._actionHandlers = {}
+        self.registerAction("cranial_access", "move_to_drill_site", self.cranial_move_to_drill_site)
+        self.registerAction("cranial_access", "make_incision", self.cranial_make_incision)
+        self.registerAction("cranial_access", "drill_hole", self.cranial_drill_hole)
+        self.registerAction("catheter_placement", "insert_catheter", self.catheter_insert_catheter)
+        self.registerAction("catheter_placement", "retract_catheter", self.catheter_retract_catheter)
+        self.registerAction("catheter_placement", "start_draining", self.catheter_drain)
+
     def createUI(self):
         """Create and return UI widgets for this procedure"""
         widgets = []
+
+        # If the UI is being created again, make sure the previous button no longer triggers phase changes
+        if self.nextPhaseButton:
+            try:
+                self.nextPhaseButton.clicked.disconnect(self.onNextPhase)
+            except Exception:
+                # The previous button may already have been deleted along with its container
+                pass
         
         # Description label
-        print(f"Current phase: {self.currentPhase}")
-        self.phaseLabel = qt.QLabel(self.phases[self.currentPhase]["name"])
-        self.phaseDescriptionLabel = qt.QLabel(self.phases[self.currentPhase]["description"])
+        logger.debug("Current phase: %s", self.currentPhase)
+        self.phaseLabel = qt.QLabel(self._phaseName)
+        self.phaseDescriptionLabel = qt.QLabel(self._phaseDescription)
         self.phaseDescriptionLabel.setWordWrap(True)
         widgets.append(self.phaseLabel)
         widgets.append(self.phaseDescriptionLabel)
 
         self.nextPhaseButton = qt.QPushButton("Next Phase")
-        self.nextPhaseButton.clicked.connect(self.onNextPhase)
+        self._connect(self.nextPhaseButton.clicked, self.onNextPhase)
         widgets.append(self.nextPhaseButton)
 
         return widgets
+
+    def _connect(self, signal, slot):
+        """Connect a signal to a slot. Signals must be signal objects (e.g. button.clicked), not SIGNAL() signature strings"""
+        if isinstance(signal, str):
+            raise TypeError(f"Connect to the signal object instead of the signature string '{signal}'")
+        signal.connect(slot)
     
+    def cleanup(self):
+        """Called by the module before the procedure is replaced or reloaded"""
+        self._tickTimer.stop()
+        self._activeMovement = None
+        self._toolTransformNode = None
+        self._intendedToolTransformNode = None
+        if self._nodeRemovedObserver is not None:
+            slicer.mrmlScene.RemoveObserver(self._nodeRemovedObserver)
+            self._nodeRemovedObserver = None
+        self._nodes.clear()
+
+    def onNodeRemoved(self, caller, event):
+        self._nodes.clear()
+
+        # The tool transform nodes held for the movement may have been removed too
+        self._toolTransformNode = None
+        self._intendedToolTransformNode = None
+        if self._activeMovement is not None:
+            # Look them up again for the movement in progress, it can't continue without the tool
+            self._toolTransformNode = self._getNode("ToolTransform")
+            self._intendedToolTransformNode = self._getNode("IntendedToolTransform")
+            if self._toolTransformNode is None:
+                logger.warning("ToolTransform was removed from the scene, stopping the movement")
+                self.stop_movement()
+                self.moving = False
+                self.currentPathCurve = None
+
+    def _getNode(self, name):
+        """Get the first scene node with the given name, looking it up in the scene only the first time"""
+        node = self._nodes.get(name)
+        if node is None or not node.GetScene():
+            node = slicer.util.getFirstNodeByName(name)
+            if node is not None:
+                self._nodes[name] = node
+        return node
+
     def getNextPhase(self):
         """Get the next phase key in the sequence"""
         if not self.currentPhase:
             # If no current phase, return the first phase
-            return list(self.phases.keys())[0] if self.phases else None
+            return self._phaseOrder[0] if self._phaseOrder else None
         
-        phaseKeys = list(self.phases.keys())
-        try:
-            currentIndex = phaseKeys.index(self.currentPhase)
-            # Check if there's a next phase
-            if currentIndex + 1 < len(phaseKeys):
-                return phaseKeys[currentIndex + 1]
-            else:
-                print("Already at the last phase")
-                return None
-        except ValueError:
-            print(f"Current phase '{self.currentPhase}' not found in phases")
+        currentIndex = self._phaseIndex.get(self.currentPhase)
+        if currentIndex is None:
+            logger.warning("Current phase '%s' not found in phases", self.currentPhase)
+            return None
+        
+        # Check if there's a next phase
+        if currentIndex + 1 < len(self._phaseOrder):
+            return self._phaseOrder[currentIndex + 1]
+        else:
+            logger.debug("Already at the last phase")
             return None
     
+    @qt.Slot()
     def onNextPhase(self):
         """Handle the next phase button click"""
         nextPhase = self.getNextPhase()
@@ -107,20 +489,23 @@ class VentriculostomySim:
 
     def setPhase(self, phaseKey):
         """Set the current phase and update available actions"""
-        if phaseKey in self.phases:
+        phaseIndex = self._phaseIndex.get(phaseKey)
+        if phaseIndex is not None:
 
             # Unregister actions based on current phase
             self.unregisterActions()
 
-            self.currentPhase = phaseKey
-            phase = self.phases[phaseKey]
-            print(f"Phase changed to: {phase['name']} - {phase['description']}")
-            print(f"Current phase: {self.currentPhase}")
+            self.currentPhase = sys.intern(phaseKey)
+            self._phaseName = self._phaseNames[phaseIndex]
+            self._phaseDescription = self._phaseDescs[phaseIndex]
+            self._currentActions = _PHASE_ACTION_NAMES.get(self.currentPhase, ())
+            logger.debug("Phase changed to: %s - %s", self._phaseName, self._phaseDescription)
+            logger.debug("Current phase: %s", self.currentPhase)
 
              # Phase-specific scene/UI changes
             if self.currentPhase == "cranial_access":
                 # Show green slice and set opacity to 0.5
-                greenNode = slicer.util.getNode("Green Volume Slice")
+                greenNode = self._getNode("Green Volume Slice")
                 greenSliceNode = slicer.mrmlScene.GetNodeByID("vtkMRMLSliceNodeGreen")
                 if greenSliceNode and greenNode:
                     greenSliceNode.SetSliceEdgeVisibility3D(False)
@@ -134,7 +519,7 @@ class VentriculostomySim:
                 greenSliceNode = slicer.mrmlScene.GetNodeByID("vtkMRMLSliceNodeGreen")
                 if greenSliceNode:
                     greenSliceNode.SetSliceVisible(False)
-                yellowNode = slicer.util.getNode("Yellow Volume Slice")
+                yellowNode = self._getNode("Yellow Volume Slice")
                 yellowSliceNode = slicer.mrmlScene.GetNodeByID("vtkMRMLSliceNodeYellow")
                 if yellowNode and yellowSliceNode:
                     yellowSliceNode.SetSliceEdgeVisibility3D(False)
@@ -142,7 +527,7 @@ class VentriculostomySim:
                     yellowNode.GetDisplayNode().SetOpacity(1.0)
 
                 # Hide trajectory model
-                trajectoryModelNode = slicer.util.getFirstNodeByName("TrajectoryModel")
+                trajectoryModelNode = self._getNode("TrajectoryModel")
                 if trajectoryModelNode:
                     # Hide the trajectory model
                     trajectoryDisplayNode = trajectoryModelNode.GetDisplayNode()
@@ -153,159 +538,70 @@ class VentriculostomySim:
             self.registerActions()
 
             # Update labels
-            self.phaseLabel.setText(self.phases[self.currentPhase]["name"])
-            self.phaseDescriptionLabel.setText(self.phases[self.currentPhase]["description"])
+            self.phaseLabel.setText(self._phaseName)
+            self.phaseDescriptionLabel.setText(self._phaseDescription)
         else:
-            print(f"Invalid phase: {phaseKey}") 
+            logger.warning("Invalid phase: %s", phaseKey)
     
     def registerActions(self):
         """Setup the procedure (register actions, etc.) for the current phase"""
         # TODO: I may need to rethink this if the actions need to be more micromanaged. Or maybe just reporting errors back is fine
-
-        # Phase cases
-        actions = []
-        if self.currentPhase == "cranial_access":
-            actions = [
-                {
-                    "name": "move_to_drill_site",
-                    "description": "Move the drill to a location on the head.",
-                    "schema": {                        
-                        "type": "object",
-                        "properties": {
-                            "location": {"type": "string", "enum": ["kochers_point_left", "kochers_point_right", "glabella", "nasion", "pterion_left", "pterion_right", "bregma", "maccartys_keyhole_left", "maccartys_keyhole_right", "keens_point_left", "keens_point_right"]},
-                        },
-                        "required": ["location"]
-                    }
-                },
-                # {
-                #     "name": "make_incision",
-                #     "description": "Make an incision on the head to prepare to start drilling.",
-                #     "schema": {
-                #     }
-                # },
-                {
-                    "name": "drill_hole",
-                    "description": "Start drilling into the skull. Doing this will move you to the next phase of the procedure.",
-                    "schema": {
-                    }
-                },                
-            ]
-        elif self.currentPhase == "catheter_placement":
-            # Add actions for catheter_placement phase here
-            actions = [
-                {
-                    "name": "insert_catheter",
-                    "description": "Insert the catheter by some distance. We want the catheter to reach the ventricles to drain them. Distance should be in mm.",
-                    "schema": {                       
-                        "type": "object",
-                        "properties": {
-                            "distance": {"type": "number", "minimum": 1, "maximum": 100},
-                        },
-                        "required": ["distance"]
-                    }
-                },
-                {
-                    "name": "retract_catheter",
-                    "description": "Retract the catheter by some distance. We want the catheter to reach the ventricles to drain them. Distance should be in mm.",
-                    "schema": {                       
-                        "type": "object",
-                        "properties": {
-                            "distance": {"type": "number", "minimum": 1, "maximum": 100},
-                        },
-                        "required": ["distance"]
-                    }
-                },
-                {
-                    "name": "start_draining",
-                    "description": "Start draining the ventricles of fluid.",
-                    "schema": {
-                    }
-                },
-            ]   
-        
-        self.websocketHandler.registerActions(actions)
+        self.websocketHandler.registerActions(_PHASE_ACTIONS.get(self.currentPhase, ()))
     
+    def registerAction(self, phaseKey, actionName, callback):
+        """Register the function that handles an action during a phase"""
+        # Interned so that lookups with an interned phase and action name compare by identity
+        self._actionHandlers[(sys.intern(phaseKey), sys.intern(actionName))] = callback
+
     def unregisterActions(self):
         """Unregister actions based on current phase"""
-        self.websocketHandler.unregisterActions(self.phases[self.currentPhase]["actions"])
-        print(f"Unregistered {len(self.phases[self.currentPhase]['actions'])} actions for {self.currentPhase}")
+        # These are the names of the actions that registerActions registered for the phase being left
+        actionNames = self._currentActions
+        if actionNames:
+            self.websocketHandler.unregisterActions(actionNames)
+        logger.debug("Unregistered %d actions for %s", len(actionNames), self.currentPhase)
 
     def onActionReceived(self, actionId, actionName, actionParams):
         """Handle an action received from Neuro"""
-        print(f"VentriculostomySim received action: {actionName} (id: {actionId})")
+        logger.debug("VentriculostomySim received action: %s (id: %s)", actionName, actionId)
 
         if self.moving:
             return False, "We are currently moving the tool. Please wait until we finish moving before performing any actions."
 
-        if self.currentPhase == "cranial_access":
-            if actionName == "move_to_drill_site":
-                actionResult, resultMessage = self.cranial_move_to_drill_site(actionParams)
-                return actionResult, resultMessage
-            elif actionName == "make_incision":
-                actionResult, resultMessage = self.cranial_make_incision(actionParams)
-                return actionResult, resultMessage
-            elif actionName == "drill_hole":
-                actionResult, resultMessage = self.cranial_drill_hole(actionParams)
-                return actionResult, resultMessage    
-            else:
-                print(f"Unknown action: {actionName}")
-                return False, f"Unknown action. {actionName} is not an available action that can be performed."
-        elif self.currentPhase == "catheter_placement":
-            if actionName == "insert_catheter":
-                actionResult, resultMessage = self.catheter_insert_catheter(actionParams)
-                return actionResult, resultMessage
-            elif actionName == "retract_catheter":
-                actionResult, resultMessage = self.catheter_retract_catheter(actionParams)
-                return actionResult, resultMessage
-            elif actionName == "start_draining":
-                actionResult, resultMessage = self.catheter_drain(actionParams)
-                return actionResult, resultMessage    
-            else:
-                print(f"Unknown action: {actionName}")
-                return False, f"Unknown action. {actionName} is not an available action that can be performed."
-        
-        return False, "Error"
+        if isinstance(actionName, str):
+            actionName = sys.intern(actionName)
+        actionHandler = self._actionHandlers.get((self.currentPhase, actionName))
+        if actionHandler is None:
+            logger.warning("Unknown action: %s", actionName)
+            return False, f"Unknown action. {actionName} is not an available action that can be performed."
 
-    # ================================Cranial Access Functions===================================
-    def cranial_move_to_drill_site(self, actionParams):
-        drillSitesFiducialNode = slicer.util.getFirstNodeByName("DrillSiteFiducials")
-        drillSiteFound = False
-        drillSitePosition = [0.0, 0.0, 0.0]
-        
-        # Parse actionParams - it comes as a JSON string
+        # The websocket handler already parses the parameters, a string here is one that wasn't valid JSON
         if isinstance(actionParams, str) and actionParams:
             try:
                 actionParams = json.loads(actionParams)
             except json.JSONDecodeError:
-                return False, "Doctor, I couldn't understand the location parameters"
-        
-        # Now extract the location
-        if isinstance(actionParams, dict):
-            requestedLocation = actionParams["location"]
-        else:
-            requestedLocation = ""
+                return False, "Doctor, I couldn't understand the parameters for that action"
+        if not isinstance(actionParams, dict):
+            actionParams = {}
+
+        return actionHandler(actionParams)
+
+    # ================================Cranial Access Functions===================================
+    def cranial_move_to_drill_site(self, actionParams):
+        drillSitesFiducialNode = self._getNode("DrillSiteFiducials")
+        requestedLocation = actionParams.get("location", "")
 
-        print(f"Requested location: {requestedLocation}")
+        logger.debug("Requested location: %s", requestedLocation)
+
+        # If we are already sitting at this drill site and nothing has changed since, there is nothing to recompute
+        if self._lastMove is not None and self._lastMove[0] == self._getMoveStateKey(requestedLocation):
+            return True, f"We are already at that drill site. {self._lastMove[1]}"
         
-        for drillSiteFiducialIndex in range(drillSitesFiducialNode.GetNumberOfControlPoints()):
-            fiducialLabel = drillSitesFiducialNode.GetNthControlPointLabel(drillSiteFiducialIndex)
-            if fiducialLabel == requestedLocation:
-                drillSitesFiducialNode.GetNthControlPointPosition(drillSiteFiducialIndex, drillSitePosition)
-                drillSiteFound = True
-                break
+        drillSitePosition = self.get_drill_site_positions(drillSitesFiducialNode).get(requestedLocation)
         
-        if not drillSiteFound:
+        if drillSitePosition is None:
             return False, "Doctor, I don't know what that drill site location is"
 
-        # Now that the drill site position is found, change IntendedToolTransform's position
-        intendedToolTransformNode = slicer.util.getFirstNodeByName("IntendedToolTransform")
-        transformMatrix = vtk.vtkMatrix4x4()
-        intendedToolTransformNode.GetMatrixTransformToParent(transformMatrix)
-        transformMatrix.SetElement(0, 3, drillSitePosition[0])
-        transformMatrix.SetElement(1, 3, drillSitePosition[1])
-        transformMatrix.SetElement(2, 3, drillSitePosition[2])
-        intendedToolTransformNode.SetMatrixTransformToParent(transformMatrix)
-
         # Now, we need to set IntendedToolTransform's orientation. This will be to the closest ventricle fiducial location
         closestVentriclePosition, closestVentricleIndex = self.find_closest_ventricle_fiducial(drillSitePosition)
         
@@ -313,18 +609,16 @@ class VentriculostomySim:
             return False, "Doctor, I can't find any ventricle fiducials to aim towards"
 
         self.selectedVentriclePosition = closestVentriclePosition
+        self._selectedVentriclePositionArr = np.asarray(closestVentriclePosition, dtype=np.float64)
 
-        # Calculate the vector to it from IntendedToolTransform's position, then set the orientation of it towards it
-        directionVector = [
-            closestVentriclePosition[0] - drillSitePosition[0],
-            closestVentriclePosition[1] - drillSitePosition[1],
-            closestVentriclePosition[2] - drillSitePosition[2]
-        ]
+        # Calculate the vector to it from the drill site, then set the orientation of IntendedToolTransform towards it
+        drillSite = np.asarray(drillSitePosition, dtype=np.float64)
+        directionVector = self._selectedVentriclePositionArr - drillSite
         
         # Normalize the direction vector
-        magnitude = (directionVector[0]**2 + directionVector[1]**2 + directionVector[2]**2)**0.5
+        magnitude = float(np.linalg.norm(directionVector))
         if magnitude > 0:
-            directionVector = [d / magnitude for d in directionVector]
+            directionVector /= magnitude
         
         # Create a rotation matrix that points the Z-axis towards the ventricle
         # Use the direction as the Z-axis (forward direction)
@@ -333,71 +627,35 @@ class VentriculostomySim:
         # Create an arbitrary perpendicular vector for X-axis
         # Choose a vector that's not parallel to Z
         if abs(zAxis[0]) < 0.9:
-            arbitrary = [1.0, 0.0, 0.0]
+            arbitrary = np.array([1.0, 0.0, 0.0])
         else:
-            arbitrary = [0.0, 1.0, 0.0]
+            arbitrary = np.array([0.0, 1.0, 0.0])
         
         # X-axis = arbitrary cross Z-axis (normalized)
-        xAxis = [
-            arbitrary[1] * zAxis[2] - arbitrary[2] * zAxis[1],
-            arbitrary[2] * zAxis[0] - arbitrary[0] * zAxis[2],
-            arbitrary[0] * zAxis[1] - arbitrary[1] * zAxis[0]
-        ]
-        xMagnitude = (xAxis[0]**2 + xAxis[1]**2 + xAxis[2]**2)**0.5
-        xAxis = [x / xMagnitude for x in xAxis]
+        xAxis = np.cross(arbitrary, zAxis)
+        xAxis /= np.linalg.norm(xAxis)
         
         # Y-axis = Z-axis cross X-axis
-        yAxis = [
-            zAxis[1] * xAxis[2] - zAxis[2] * xAxis[1],
-            zAxis[2] * xAxis[0] - zAxis[0] * xAxis[2],
-            zAxis[0] * xAxis[1] - zAxis[1] * xAxis[0]
-        ]
+        yAxis = np.cross(zAxis, xAxis)
         
-        # Set the rotation part of the transform matrix (columns 0-2, rows 0-2)
-        transformMatrix.SetElement(0, 0, xAxis[0])
-        transformMatrix.SetElement(1, 0, xAxis[1])
-        transformMatrix.SetElement(2, 0, xAxis[2])
-        
-        transformMatrix.SetElement(0, 1, yAxis[0])
-        transformMatrix.SetElement(1, 1, yAxis[1])
-        transformMatrix.SetElement(2, 1, yAxis[2])
-        
-        transformMatrix.SetElement(0, 2, zAxis[0])
-        transformMatrix.SetElement(1, 2, zAxis[1])
-        transformMatrix.SetElement(2, 2, zAxis[2])
-        
-        # Apply the updated matrix to the transform node
-        intendedToolTransformNode.SetMatrixTransformToParent(transformMatrix)
+        # Set the rotation (columns 0-2) and the position (column 3) of IntendedToolTransform in a single update
+        intendedToolTransformNode = self._getNode("IntendedToolTransform")
+        transformArray = slicer.util.arrayFromTransformMatrix(intendedToolTransformNode)
+        transformArray[:3, 0] = xAxis
+        transformArray[:3, 1] = yAxis
+        transformArray[:3, 2] = zAxis
+        transformArray[:3, 3] = drillSite
+        slicer.util.updateTransformMatrixFromArray(intendedToolTransformNode, transformArray)
         
         # Change the length of the trajectory model to match the distance to the ventricle fiducial
-        trajectoryModelNode = slicer.util.getFirstNodeByName("TrajectoryModel")
+        trajectoryModelNode = self._getNode("TrajectoryModel")
         if trajectoryModelNode:
             # Hide the trajectory model
             trajectoryDisplayNode = trajectoryModelNode.GetDisplayNode()
             if trajectoryDisplayNode:
                 trajectoryDisplayNode.SetVisibility(False)
             
-            # Create a cylinder with the correct length (height = distance to ventricle)
-            cylinderSource = vtk.vtkCylinderSource()
-            cylinderSource.SetHeight(magnitude)
-            cylinderSource.SetRadius(3.0)  # 1mm radius for visibility
-            cylinderSource.SetResolution(20)
-            cylinderSource.Update()
-            
-            # The cylinder is created along Y-axis by default, we need it along Z-axis
-            # Create a transform to rotate it 90 degrees around X to align with Z
-            # Then translate it so the origin is at one end (the base)
-            transform = vtk.vtkTransform()
-            transform.Translate(0, 0, magnitude / 2.0)  # Move origin to the base of the cylinder
-            transform.RotateX(90)
-            
-            transformFilter = vtk.vtkTransformPolyDataFilter()
-            transformFilter.SetInputConnection(cylinderSource.GetOutputPort())
-            transformFilter.SetTransform(transform)
-            transformFilter.Update()
-            
-            # Set the new polydata on the trajectory model
-            trajectoryModelNode.SetAndObservePolyData(transformFilter.GetOutput())
+            self.set_trajectory_length(trajectoryModelNode, magnitude)
 
         # Create a path from the current location to the intended location
         pathCurve = self.generate_safety_path()
@@ -405,11 +663,13 @@ class VentriculostomySim:
         # Initiate the movement towards it
         if pathCurve:
             # Set skull model to have opacity 1.0
-            skullModelNode = slicer.util.getFirstNodeByName("SkullModel")
+            skullModelNode = self._getNode("SkullModel")
             if skullModelNode:
                 skullDisplayNode = skullModelNode.GetDisplayNode()
                 if skullDisplayNode:
                     skullDisplayNode.SetOpacity(1.00)
+            self._moveLocation = requestedLocation
+            self._lastMove = None
             self.start_path_movement(pathCurve)
         else:
             return False, "Doctor, I couldn't generate a safe path to that location"
@@ -417,46 +677,67 @@ class VentriculostomySim:
         # This is enough for the action for now, we need to send the result back to Neuro
         return True, "We are moving towards your chosen potential drill site. You will need to wait until we reach it."
 
+    def set_trajectory_length(self, trajectoryModelNode, length):
+        """Stretch the trajectory model to the given length by scaling the shared unit cylinder along Z"""
+        if trajectoryModelNode.GetPolyData() is not _UNIT_TRAJECTORY_POLY:
+            trajectoryModelNode.SetAndObservePolyData(_UNIT_TRAJECTORY_POLY)
+
+        # The scale transform is inserted between the trajectory model and its original parent transform
+        scaleTransformNode = self._trajectoryScaleTransform
+        if scaleTransformNode is None or not scaleTransformNode.GetScene():
+            scaleTransformNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLLinearTransformNode", "TrajectoryScaleTransform")
+            scaleTransformNode.SetAndObserveTransformNodeID(trajectoryModelNode.GetTransformNodeID())
+            trajectoryModelNode.SetAndObserveTransformNodeID(scaleTransformNode.GetID())
+            self._trajectoryScaleTransform = scaleTransformNode
+
+        scaleMatrix = np.eye(4)
+        scaleMatrix[2, 2] = length
+        slicer.util.updateTransformMatrixFromArray(scaleTransformNode, scaleMatrix)
+
     def check_drill_site(self):
         """This is called after arriving at a potential drill site. We see if we will hit any blood vessels"""
         # Set skull model to have opacity 0.5
-        skullModelNode = slicer.util.getFirstNodeByName("SkullModel")
+        skullModelNode = self._getNode("SkullModel")
         if skullModelNode:
             skullDisplayNode = skullModelNode.GetDisplayNode()
             if skullDisplayNode:
                 skullDisplayNode.SetOpacity(0.1)
         
-        trajectoryModelNode = slicer.util.getFirstNodeByName("TrajectoryModel")
-        vesselsModelNode = slicer.util.getFirstNodeByName("VesselsModel")
+        trajectoryModelNode = self._getNode("TrajectoryModel")
+        vesselsModelNode = self._getNode("VesselsModel")
 
         # See if the trajectory model intersects with any polys from the Vessel model
         trajectoryPolyData = trajectoryModelNode.GetPolyData()
         vesselsPolyData = vesselsModelNode.GetPolyData()
         
         # Use VTK collision detection filter
-        collisionDetection = vtk.vtkCollisionDetectionFilter()
+        collisionDetection = self._collisionDetection
+        if collisionDetection is None:
+            self._trajectoryWorldMatrix = vtk.vtkMatrix4x4()
+            self._vesselsWorldMatrix = vtk.vtkMatrix4x4()
+            collisionDetection = vtk.vtkCollisionDetectionFilter()
+            collisionDetection.SetMatrix(0, self._trajectoryWorldMatrix)
+            collisionDetection.SetMatrix(1, self._vesselsWorldMatrix)
+            collisionDetection.SetBoxTolerance(0.0)
+            collisionDetection.SetCellTolerance(0.0)
+            collisionDetection.SetNumberOfCellsPerNode(2)
+            self._collisionDetection = collisionDetection
         collisionDetection.SetInputData(0, trajectoryPolyData)
         collisionDetection.SetInputData(1, vesselsPolyData)
         
         # Get the world transform matrices for both models
-        trajectoryMatrix = vtk.vtkMatrix4x4()
         trajectoryParentTransform = trajectoryModelNode.GetParentTransformNode()
         if trajectoryParentTransform:
-            trajectoryParentTransform.GetMatrixTransformToWorld(trajectoryMatrix)
-        # else trajectoryMatrix remains as identity
+            trajectoryParentTransform.GetMatrixTransformToWorld(self._trajectoryWorldMatrix)
+        else:
+            self._trajectoryWorldMatrix.Identity()
         
-        vesselsMatrix = vtk.vtkMatrix4x4()
         vesselsParentTransform = vesselsModelNode.GetParentTransformNode()
         if vesselsParentTransform:
-            vesselsParentTransform.GetMatrixTransformToWorld(vesselsMatrix)
-        # else vesselsMatrix remains as identity
-        
-        collisionDetection.SetMatrix(0, trajectoryMatrix)
-        collisionDetection.SetMatrix(1, vesselsMatrix)
+            vesselsParentTransform.GetMatrixTransformToWorld(self._vesselsWorldMatrix)
+        else:
+            self._vesselsWorldMatrix.Identity()
         
-        collisionDetection.SetBoxTolerance(0.0)
-        collisionDetection.SetCellTolerance(0.0)
-        collisionDetection.SetNumberOfCellsPerNode(2)
         collisionDetection.Update()
         
         intersects = collisionDetection.GetNumberOfContacts() > 0
@@ -479,6 +760,16 @@ class VentriculostomySim:
         
         # Send a context message back reporting if the trajectory is good and informing that we can proceed with the next action of making an incision (maybe I should register/unregister for this instead)
         self.websocketHandler.sendContext(reportMessage, False)
+        return reportMessage
+
+    def _getMoveStateKey(self, location):
+        """Key identifying the drill site location together with the current tool and fiducial node states"""
+        return (
+            location,
+            self._getNode("ToolTransform").GetMTime(),
+            self._getNode("DrillSiteFiducials").GetMTime(),
+            self._getNode("VentricleFiducials").GetMTime(),
+        )
 
     def find_closest_ventricle_fiducial(self, drillSitePosition):
         """Find the closest ventricle fiducial to the given position.
@@ -489,30 +780,62 @@ class VentriculostomySim:
         Returns:
             Tuple of (closestPosition, closestIndex) or (None, -1) if no fiducials found
         """
-        ventricleFiducialNode = slicer.util.getFirstNodeByName("VentricleFiducials")
+        ventricleFiducialNode = self._getNode("VentricleFiducials")
         
         if not ventricleFiducialNode or ventricleFiducialNode.GetNumberOfControlPoints() == 0:
             return None, -1
         
-        closestDistance = float('inf')
-        closestIndex = -1
-        closestPosition = [0.0, 0.0, 0.0]
+        # Compare squared distances to all the fiducial positions at once (same closest point, no sqrt)
+        ventriclePositions = self.get_ventricle_positions(ventricleFiducialNode)
+        differences = ventriclePositions - np.asarray(drillSitePosition, dtype=np.float64)
+        squaredDistances = np.einsum("ij,ij->i", differences, differences)
+        closestIndex = int(squaredDistances.argmin())
         
-        for fiducialIndex in range(ventricleFiducialNode.GetNumberOfControlPoints()):
-            currentPosition = [0.0, 0.0, 0.0]
-            ventricleFiducialNode.GetNthControlPointPosition(fiducialIndex, currentPosition)
-            
-            # Calculate Euclidean distance
-            distance = ((currentPosition[0] - drillSitePosition[0]) ** 2 +
-                       (currentPosition[1] - drillSitePosition[1]) ** 2 +
-                       (currentPosition[2] - drillSitePosition[2]) ** 2) ** 0.5
+        return ventriclePositions[closestIndex].tolist(), closestIndex
+
+    def get_drill_site_positions(self, drillSitesFiducialNode):
+        """Get the drill site positions keyed by label. They are only read from the node again if it has changed."""
+        nodeMTime = drillSitesFiducialNode.GetMTime()
+        if self._drillSiteCache is None or self._drillSiteCache[0] is not drillSitesFiducialNode or self._drillSiteCache[1] != nodeMTime:
+            drillSitePositions = {}
+            for drillSiteFiducialIndex in range(drillSitesFiducialNode.GetNumberOfControlPoints()):
+                drillSitePosition = [0.0, 0.0, 0.0]
+                drillSitesFiducialNode.GetNthControlPointPosition(drillSiteFiducialIndex, drillSitePosition)
+                # If labels are repeated, the first fiducial with the label is used
+                drillSitePositions.setdefault(drillSitesFiducialNode.GetNthControlPointLabel(drillSiteFiducialIndex), drillSitePosition)
+            self._drillSiteCache = (drillSitesFiducialNode, nodeMTime, drillSitePositions)
+        return self._drillSiteCache[2]
+
+    def get_ventricle_positions(self, ventricleFiducialNode):
+        """Get the ventricle fiducial positions as an (N, 3) array. They are only read from the node again if it has changed."""
+        nodeMTime = ventricleFiducialNode.GetMTime()
+        if self._ventricleCache is None or self._ventricleCache[0] is not ventricleFiducialNode or self._ventricleCache[1] != nodeMTime:
+            self._ventricleCache = (ventricleFiducialNode, nodeMTime, slicer.util.arrayFromMarkupsControlPoints(ventricleFiducialNode))
+        return self._ventricleCache[2]
+
+    def get_safety_zone_geometry(self, safetyZoneModelNode):
+        """Get the safety zone sphere (center, radius) from its bounds, only recomputed if the model's polydata changes"""
+        safetyZonePolyData = safetyZoneModelNode.GetPolyData()
+        polyDataMTime = safetyZonePolyData.GetMTime()
+        if self._safetyZoneGeom is None or self._safetyZoneGeom[0] is not safetyZonePolyData or self._safetyZoneGeom[1] != polyDataMTime:
+            safetyZoneBounds = np.asarray(safetyZonePolyData.GetBounds(), dtype=np.float64).reshape(3, 2)
+            safetyZoneCenter = safetyZoneBounds.mean(axis=1)
+            safetyZoneRadius = float((safetyZoneBounds[:, 1] - safetyZoneBounds[:, 0]).max() / 2.0)
             
-            if distance < closestDistance:
-                closestDistance = distance
-                closestIndex = fiducialIndex
-                closestPosition = currentPosition.copy()
-        
-        return closestPosition, closestIndex
+            # Add a small buffer to the radius for safety
+            safetyBuffer = 5.0  # mm
+            safetyZoneRadius += safetyBuffer
+            self._safetyZoneGeom = (safetyZonePolyData, polyDataMTime, (safetyZoneCenter, safetyZoneRadius))
+        return self._safetyZoneGeom[2]
+
+    def get_skull_center(self, skullModelNode):
+        """Get the skull center (approximated from bounds), only recomputed if the model's polydata changes"""
+        skullPolyData = skullModelNode.GetPolyData()
+        polyDataMTime = skullPolyData.GetMTime()
+        if self._skullGeom is None or self._skullGeom[0] is not skullPolyData or self._skullGeom[1] != polyDataMTime:
+            skullBounds = np.asarray(skullPolyData.GetBounds(), dtype=np.float64).reshape(3, 2)
+            self._skullGeom = (skullPolyData, polyDataMTime, skullBounds.mean(axis=1))
+        return self._skullGeom[2]
 
     def generate_safety_path(self):
         """Generate a path from ToolTransform to IntendedToolTransform that avoids SafetyZoneModel.
@@ -525,210 +848,56 @@ class VentriculostomySim:
         Returns:
             vtkMRMLMarkupsCurveNode containing the path waypoints, or None if path cannot be generated
         """
-        import math
-        
         # Get the required nodes
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
-        intendedToolTransformNode = slicer.util.getFirstNodeByName("IntendedToolTransform")
-        safetyZoneModelNode = slicer.util.getFirstNodeByName("SafetyZoneModel")
-        skullModelNode = slicer.util.getFirstNodeByName("SkullModel")
+        toolTransformNode = self._getNode("ToolTransform")
+        intendedToolTransformNode = self._getNode("IntendedToolTransform")
+        safetyZoneModelNode = self._getNode("SafetyZoneModel")
+        skullModelNode = self._getNode("SkullModel")
         
         if not all([toolTransformNode, intendedToolTransformNode, safetyZoneModelNode, skullModelNode]):
-            print("Error: Could not find all required nodes for path generation")
+            logger.error("Could not find all required nodes for path generation")
             return None
         
-        # Get current tool position
-        toolMatrix = vtk.vtkMatrix4x4()
-        toolTransformNode.GetMatrixTransformToParent(toolMatrix)
-        currentPos = [
-            toolMatrix.GetElement(0, 3),
-            toolMatrix.GetElement(1, 3),
-            toolMatrix.GetElement(2, 3)
-        ]
+        # Get current and intended tool positions from the translation column of each transform
+        currentPos = slicer.util.arrayFromTransformMatrix(toolTransformNode)[:3, 3]
+        targetPos = slicer.util.arrayFromTransformMatrix(intendedToolTransformNode)[:3, 3]
         
-        # Get intended tool position
-        intendedMatrix = vtk.vtkMatrix4x4()
-        intendedToolTransformNode.GetMatrixTransformToParent(intendedMatrix)
-        targetPos = [
-            intendedMatrix.GetElement(0, 3),
-            intendedMatrix.GetElement(1, 3),
-            intendedMatrix.GetElement(2, 3)
-        ]
-        
-        # Get safety zone sphere center and radius
-        safetyZonePolyData = safetyZoneModelNode.GetPolyData()
-        safetyZoneBounds = [0, 0, 0, 0, 0, 0]
-        safetyZonePolyData.GetBounds(safetyZoneBounds)
+        safetyZoneCenter, safetyZoneRadius = self.get_safety_zone_geometry(safetyZoneModelNode)
+        skullCenter = self.get_skull_center(skullModelNode)
         
-        safetyZoneCenter = [
-            (safetyZoneBounds[0] + safetyZoneBounds[1]) / 2.0,
-            (safetyZoneBounds[2] + safetyZoneBounds[3]) / 2.0,
-            (safetyZoneBounds[4] + safetyZoneBounds[5]) / 2.0
-        ]
-        
-        safetyZoneRadius = max(
-            (safetyZoneBounds[1] - safetyZoneBounds[0]) / 2.0,
-            (safetyZoneBounds[3] - safetyZoneBounds[2]) / 2.0,
-            (safetyZoneBounds[5] - safetyZoneBounds[4]) / 2.0
+        waypoints = _compute_safety_waypoints(
+            currentPos,
+            targetPos,
+            safetyZoneCenter,
+            safetyZoneRadius,
+            skullCenter,
         )
         
-        # Add a small buffer to the radius for safety
-        safetyBuffer = 5.0  # mm
-        safetyZoneRadius += safetyBuffer
-        
-        # Get skull center (approximated from bounds)
-        skullPolyData = skullModelNode.GetPolyData()
-        skullBounds = [0, 0, 0, 0, 0, 0]
-        skullPolyData.GetBounds(skullBounds)
-        
-        skullCenter = [
-            (skullBounds[0] + skullBounds[1]) / 2.0,
-            (skullBounds[2] + skullBounds[3]) / 2.0,
-            (skullBounds[4] + skullBounds[5]) / 2.0
-        ]
-        
-        # Helper function to calculate distance between two points
-        def distance(p1, p2):
-            return math.sqrt(sum((a - b) ** 2 for a, b in zip(p1, p2)))
-        
-        # Helper function to normalize a vector
-        def normalize(v):
-            mag = math.sqrt(sum(x ** 2 for x in v))
-            return [x / mag for x in v] if mag > 0 else [0, 0, 0]
-        
-        # Helper function to add two vectors
-        def add_vectors(v1, v2):
-            return [a + b for a, b in zip(v1, v2)]
-        
-        # Helper function to scale a vector
-        def scale_vector(v, scale):
-            return [x * scale for x in v]
-        
-        waypoints = []
-        
-        # SEGMENT 1: Retract away from skull if currently inside safety zone
-        distFromSafetyZone = distance(currentPos, safetyZoneCenter)
-        
-        if distFromSafetyZone < safetyZoneRadius:
-            # Calculate direction away from skull (from skull center to current position)
-            retractDirection = normalize([
-                currentPos[0] - skullCenter[0],
-                currentPos[1] - skullCenter[1],
-                currentPos[2] - skullCenter[2]
-            ])
-            
-            # Calculate how far we need to move to get outside the safety zone
-            # We want to be at safetyZoneRadius distance from safetyZoneCenter
-            # Move along retractDirection until we're outside
-            retractDistance = safetyZoneRadius - distFromSafetyZone + 10.0  # +10mm extra clearance
-            
-            retractPos = add_vectors(currentPos, scale_vector(retractDirection, retractDistance))
-            waypoints.append(retractPos)
-            startPos = retractPos
-        else:
-            startPos = currentPos
-        
-        # SEGMENT 2: Arc around the safety zone
-        # Calculate if a straight line from startPos to targetPos intersects the safety zone
-        dirToTarget = [
-            targetPos[0] - startPos[0],
-            targetPos[1] - startPos[1],
-            targetPos[2] - startPos[2]
-        ]
-        distToTarget = math.sqrt(sum(x ** 2 for x in dirToTarget))
-        
-        if distToTarget > 0:
-            dirToTargetNorm = normalize(dirToTarget)
-            
-            # Find the closest point on the line from startPos to targetPos to the safety zone center
-            # Using vector projection
-            vecToCenter = [
-                safetyZoneCenter[0] - startPos[0],
-                safetyZoneCenter[1] - startPos[1],
-                safetyZoneCenter[2] - startPos[2]
-            ]
-            
-            projectionLength = sum(a * b for a, b in zip(vecToCenter, dirToTargetNorm))
-            projectionLength = max(0, min(projectionLength, distToTarget))  # Clamp to line segment
-            
-            closestPointOnLine = add_vectors(startPos, scale_vector(dirToTargetNorm, projectionLength))
-            distFromLineToCenter = distance(closestPointOnLine, safetyZoneCenter)
-            
-            # If the direct path would intersect the safety zone, create arc waypoints
-            if distFromLineToCenter < safetyZoneRadius:
-                # Create a tangent path around the sphere
-                # Find the tangent point on the sphere closest to the target
-                
-                # Direction from safety zone center to target
-                centerToTarget = normalize([
-                    targetPos[0] - safetyZoneCenter[0],
-                    targetPos[1] - safetyZoneCenter[1],
-                    targetPos[2] - safetyZoneCenter[2]
-                ])
-                
-                # Create intermediate waypoints around the sphere
-                # Use 3 waypoints for a smooth arc
-                numArcPoints = 3
-                
-                for i in range(numArcPoints):
-                    t = (i + 1) / (numArcPoints + 1)  # Interpolation factor
-                    
-                    # Spherical interpolation around the safety zone
-                    # Start from direction of startPos, end at direction of targetPos
-                    startDir = normalize([
-                        startPos[0] - safetyZoneCenter[0],
-                        startPos[1] - safetyZoneCenter[1],
-                        startPos[2] - safetyZoneCenter[2]
-                    ])
-                    
-                    # Interpolate between start and target directions
-                    interpDir = [
-                        startDir[0] * (1 - t) + centerToTarget[0] * t,
-                        startDir[1] * (1 - t) + centerToTarget[1] * t,
-                        startDir[2] * (1 - t) + centerToTarget[2] * t
-                    ]
-                    interpDir = normalize(interpDir)
-                    
-                    # Place waypoint at safety zone radius distance from center
-                    arcPoint = add_vectors(
-                        safetyZoneCenter,
-                        scale_vector(interpDir, safetyZoneRadius + 5.0)  # +5mm clearance
-                    )
-                    
-                    waypoints.append(arcPoint)
-        
-        # SEGMENT 3: Approach - move to the final target position
-        waypoints.append(targetPos)
-        
         # Debug output
-        print(f"Generated path with {len(waypoints)} waypoints")
-        for i, wp in enumerate(waypoints):
-            print(f"  Waypoint {i}: [{wp[0]:.2f}, {wp[1]:.2f}, {wp[2]:.2f}]")
-        
-        # Create a markups curve node with the waypoints
-        # Remove any existing safety path curve
-        existingCurve = slicer.util.getFirstNodeByName("PathCurve")
-        if existingCurve:
-            slicer.mrmlScene.RemoveNode(existingCurve)
-        
-        # Create new curve node
-        curveNode = slicer.mrmlScene.AddNewNodeByClass('vtkMRMLMarkupsCurveNode', "PathCurve")
-        
-        # Add the current position as the first control point
-        curveNode.AddControlPoint(currentPos[0], currentPos[1], currentPos[2])
-        
-        # Add all waypoints as control points
-        for i, waypoint in enumerate(waypoints):
-            curveNode.AddControlPoint(waypoint[0], waypoint[1], waypoint[2])
-        
-        # Configure the curve appearance
-        curveNode.SetCurveTypeToLinear()  # Use linear interpolation between points
-        displayNode = curveNode.GetDisplayNode()
-        if displayNode:
-            displayNode.SetSelectedColor(1.0, 1.0, 1.0)  # White color
-            displayNode.SetLineWidth(2.0)
-            displayNode.SetTextScale(0.0)  # Hide labels
-            displayNode.SetVisibility(False)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated path with %d waypoints", len(waypoints))
+            for i, wp in enumerate(waypoints):
+                logger.debug("  Waypoint %d: [%.2f, %.2f, %.2f]", i, wp[0], wp[1], wp[2])
+        
+        # Reuse the safety path curve node if it exists, otherwise create and configure it
+        curveNode = self._getNode("PathCurve")
+        if curveNode is None:
+            curveNode = slicer.mrmlScene.AddNewNodeByClass('vtkMRMLMarkupsCurveNode', "PathCurve")
+            
+            # Configure the curve appearance
+            curveNode.SetCurveTypeToLinear()  # Use linear interpolation between points
+            displayNode = curveNode.GetDisplayNode()
+            if displayNode:
+                displayNode.SetSelectedColor(1.0, 1.0, 1.0)  # White color
+                displayNode.SetLineWidth(2.0)
+                displayNode.SetTextScale(0.0)  # Hide labels
+                displayNode.SetVisibility(False)
+        
+        # Set the current position followed by all waypoints as the control points in a single update,
+        # batching the curve node's modified events so the curve is only recomputed once
+        wasModifying = curveNode.StartModify()
+        slicer.util.updateMarkupsControlPointsFromArray(curveNode, np.vstack((currentPos, waypoints)))
+        curveNode.EndModify(wasModifying)
         
         return curveNode
 
@@ -737,23 +906,23 @@ class VentriculostomySim:
 
     def cranial_drill_hole(self, actionParams=None):
         # Turn off volume rendering visibility for the brain
-        brainVolumeNode = slicer.util.getFirstNodeByName("GradientEchoIR_Stripped")
+        brainVolumeNode = self._getNode("GradientEchoIR_Stripped")
         if brainVolumeNode:
             brainVolumeNode.SetDisplayVisibility(False)
 
-        drillModelNode = slicer.util.getFirstNodeByName("DrillModel")
+        drillModelNode = self._getNode("DrillModel")
         if drillModelNode:
             drillModelDisplayNode = drillModelNode.GetDisplayNode()
             if drillModelDisplayNode:
                 drillModelDisplayNode.SetVisibility(False)
 
-        catheterModelNode = slicer.util.getFirstNodeByName("CatheterModel")
+        catheterModelNode = self._getNode("CatheterModel")
         if catheterModelNode:
             catheterModelDisplayNode = catheterModelNode.GetDisplayNode()
             if catheterModelDisplayNode:
                 catheterModelDisplayNode.SetVisibility(True)
 
-        targetedPointModelNode = slicer.util.getFirstNodeByName("TargetedPointModel")
+        targetedPointModelNode = self._getNode("TargetedPointModel")
         if targetedPointModelNode:
             targetedPointModelDisplayNode = targetedPointModelNode.GetDisplayNode()
             if targetedPointModelDisplayNode:
@@ -763,62 +932,96 @@ class VentriculostomySim:
         
         return True, "Doctor, we have successfully drilled the burr hole and are now ready to insert the catheter"
 
+    def start_movement(self, updateMovement):
+        """Make updateMovement the active movement animation and start the tick timer if it isn't running"""
+        self._activeMovement = updateMovement
+        if not self._tickTimer.isActive():
+            self._tickTimer.start()
+
+    def stop_movement(self):
+        """Stop the active movement animation"""
+        self._activeMovement = None
+        self._tickTimer.stop()
+
+    @qt.Slot()
+    def onTick(self):
+        if self._activeMovement is None:
+            self._tickTimer.stop()
+            return
+        self._activeMovement()
+
     def start_path_movement(self, pathCurve):
         """Start animated movement along the path curve.
         
+        The tool pose for every timer tick of the movement is computed up front, so the ticks only need to look it up.
+        
         Args:
             pathCurve: vtkMRMLMarkupsCurveNode to follow
         """
-        import time
-        
         self.currentPathCurve = pathCurve
         self.moving = True
+        self._pathPoses = None
         
         # Calculate total path length
         self.movementTotalDistance = pathCurve.GetCurveLengthWorld()
         
         # Capture starting and target orientations as quaternions
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
-        intendedToolTransformNode = slicer.util.getFirstNodeByName("IntendedToolTransform")
+        toolTransformNode = self._toolTransformNode = self._getNode("ToolTransform")
+        intendedToolTransformNode = self._intendedToolTransformNode = self._getNode("IntendedToolTransform")
         
         if toolTransformNode and intendedToolTransformNode:
-            # Get start orientation
-            startMatrix = vtk.vtkMatrix4x4()
-            toolTransformNode.GetMatrixTransformToParent(startMatrix)
-            self.startOrientation = vtk.vtkQuaternion[float]()
-            vtk.vtkMath.Matrix3x3ToQuaternion([
-                [startMatrix.GetElement(i, j) for j in range(3)] for i in range(3)
-            ], self.startOrientation)
+            # Get start orientation (as w, x, y, z)
+            startRotation = slicer.util.arrayFromTransformMatrix(toolTransformNode)[:3, :3]
+            startOrientation = [0.0, 0.0, 0.0, 0.0]
+            vtk.vtkMath.Matrix3x3ToQuaternion(startRotation.tolist(), startOrientation)
+            self.startOrientation = np.array(startOrientation)
+            
+            # Get target orientation (as w, x, y, z)
+            targetRotation = slicer.util.arrayFromTransformMatrix(intendedToolTransformNode)[:3, :3]
+            targetOrientation = [0.0, 0.0, 0.0, 0.0]
+            vtk.vtkMath.Matrix3x3ToQuaternion(targetRotation.tolist(), targetOrientation)
+            self.targetOrientation = np.array(targetOrientation)
+            
+            # One sample per timer tick, spaced by the distance the tool moves in one tick
+            self._pathSampleSpacing = self.movementSpeed * self._tickTimer.interval / 1000.0
+            numSamples = max(1, math.ceil(self.movementTotalDistance / self._pathSampleSpacing))
+            sampleDistances = np.arange(numSamples) * self._pathSampleSpacing
+            
+            # Get the positions along the curve at the sample distances by interpolating the curve points
+            # by arc length, rather than asking the curve node to walk the curve for every sample
+            curvePoints = slicer.util.arrayFromMarkupsCurvePoints(pathCurve, world=True)
+            arcLengths = np.concatenate(([0.0], np.cumsum(np.sqrt(np.sum(np.diff(curvePoints, axis=0) ** 2, axis=1)))))
+            positions = np.empty((numSamples, 3))
+            for axis in range(3):
+                positions[:, axis] = np.interp(sampleDistances, arcLengths, curvePoints[:, axis])
             
-            # Get target orientation
-            targetMatrix = vtk.vtkMatrix4x4()
-            intendedToolTransformNode.GetMatrixTransformToParent(targetMatrix)
-            self.targetOrientation = vtk.vtkQuaternion[float]()
-            vtk.vtkMath.Matrix3x3ToQuaternion([
-                [targetMatrix.GetElement(i, j) for j in range(3)] for i in range(3)
-            ], self.targetOrientation)
+            # Calculate progress along path (0.0 to 1.0) at each sample
+            progress = sampleDistances / self.movementTotalDistance if self.movementTotalDistance > 0 else np.zeros(numSamples)
+            orientations = _slerp_quaternions(self.startOrientation, self.targetOrientation, progress)
+            
+            # Tool transform matrix at each sample
+            poses = np.zeros((numSamples, 4, 4))
+            poses[:, :3, :3] = _quaternions_to_matrices(orientations)
+            poses[:, :3, 3] = positions
+            poses[:, 3, 3] = 1.0
+            self._pathPoses = poses
         
         # Store start time
-        self.movementStartTime = time.time()
-        
-        # Create and start timer (update every 50ms for smooth animation)
-        if self.movementTimer is None:
-            self.movementTimer = qt.QTimer()
-            self.movementTimer.timeout.connect(self.update_path_movement)
+        self.movementStartTime = time.perf_counter()
         
-        self.movementTimer.start(50)  # 50ms = 20 FPS
+        self.start_movement(self.update_path_movement)
         
-        print(f"Starting movement along path (length: {self.movementTotalDistance:.2f} mm, speed: {self.movementSpeed} mm/s)")
+        logger.debug("Starting movement along path (length: %.2f mm, speed: %s mm/s)", self.movementTotalDistance, self.movementSpeed)
 
     def update_path_movement(self):
-        """Update the tool position along the path curve (called by timer)."""
-        import time
-        
+        """Update the tool position along the path curve (called by the tick timer)."""
         if not self.moving or self.currentPathCurve is None:
+            # Nothing is moving anymore, so don't keep ticking
+            self.stop_movement()
             return
         
         # Calculate elapsed time and distance traveled
-        elapsedTime = time.time() - self.movementStartTime
+        elapsedTime = time.perf_counter() - self.movementStartTime
         distanceTraveled = elapsedTime * self.movementSpeed
         
         # Check if we've reached the end
@@ -826,63 +1029,24 @@ class VentriculostomySim:
             self.complete_path_movement()
             return
         
-        # Calculate progress along path (0.0 to 1.0)
-        progress = distanceTraveled / self.movementTotalDistance if self.movementTotalDistance > 0 else 0.0
-        
-        # Get position along curve at the current distance
-        position = [0.0, 0.0, 0.0]
-        self.currentPathCurve.GetPositionAlongCurveWorld(position, 0, distanceTraveled)
-        
-        # Update ToolTransform position and orientation
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
-        if toolTransformNode and self.startOrientation and self.targetOrientation:
-            toolMatrix = vtk.vtkMatrix4x4()
-            toolTransformNode.GetMatrixTransformToParent(toolMatrix)
-            
-            # Interpolate orientation using SLERP (Spherical Linear Interpolation)
-            interpolatedQuat = vtk.vtkQuaternion[float]()
-            interpolatedQuat.SetW(
-                self.startOrientation.GetW() * (1.0 - progress) + self.targetOrientation.GetW() * progress
-            )
-            interpolatedQuat.SetX(
-                self.startOrientation.GetX() * (1.0 - progress) + self.targetOrientation.GetX() * progress
-            )
-            interpolatedQuat.SetY(
-                self.startOrientation.GetY() * (1.0 - progress) + self.targetOrientation.GetY() * progress
-            )
-            interpolatedQuat.SetZ(
-                self.startOrientation.GetZ() * (1.0 - progress) + self.targetOrientation.GetZ() * progress
-            )
-            interpolatedQuat.Normalize()
-            
-            # Convert quaternion back to rotation matrix
-            rotationMatrix = [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
-            vtk.vtkMath.QuaternionToMatrix3x3(interpolatedQuat, rotationMatrix)
-            
-            # Update rotation part of transform matrix (3x3 upper-left)
-            for i in range(3):
-                for j in range(3):
-                    toolMatrix.SetElement(i, j, rotationMatrix[i][j])
-            
-            # Update position elements (translation)
-            toolMatrix.SetElement(0, 3, position[0])
-            toolMatrix.SetElement(1, 3, position[1])
-            toolMatrix.SetElement(2, 3, position[2])
-            
+        # Update ToolTransform position and orientation to the precomputed pose for the distance traveled
+        toolTransformNode = self._toolTransformNode
+        if toolTransformNode and self._pathPoses is not None:
+            sampleIndex = min(int(distanceTraveled / self._pathSampleSpacing), len(self._pathPoses) - 1)
+            toolMatrix = self._toolMatrix
+            toolMatrix.DeepCopy(self._pathPoses[sampleIndex].ravel())
             toolTransformNode.SetMatrixTransformToParent(toolMatrix)
 
     def complete_path_movement(self):
         """Complete the path movement and notify that we're ready."""
-        # Stop the timer
-        if self.movementTimer:
-            self.movementTimer.stop()
+        self.stop_movement()
         
         # Set the tool to the exact final position (IntendedToolTransform)
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
-        intendedToolTransformNode = slicer.util.getFirstNodeByName("IntendedToolTransform")
+        toolTransformNode = self._toolTransformNode
+        intendedToolTransformNode = self._intendedToolTransformNode
         
         if toolTransformNode and intendedToolTransformNode:
-            intendedMatrix = vtk.vtkMatrix4x4()
+            intendedMatrix = self._scratchMatrix
             intendedToolTransformNode.GetMatrixTransformToParent(intendedMatrix)
             toolTransformNode.SetMatrixTransformToParent(intendedMatrix)
         
@@ -891,51 +1055,24 @@ class VentriculostomySim:
         self.currentPathCurve = None
         
         # Check the drill site for vessel collisions
-        self.check_drill_site()
+        reportMessage = self.check_drill_site()
+        if self._moveLocation is not None:
+            self._lastMove = (self._getMoveStateKey(self._moveLocation), reportMessage)
+            self._moveLocation = None
         
-        print("Movement complete - arrived at destination")
+        logger.debug("Movement complete - arrived at destination")
     # ===========================================================================================
 
     # ==============================Catheter Placement Functions================================
     def catheter_insert_catheter(self, actionParams):
-        # Parse actionParams - it comes as a JSON string
-        if isinstance(actionParams, str) and actionParams:
-            try:
-                actionParams = json.loads(actionParams)
-            except json.JSONDecodeError:
-                return False, "Doctor, I couldn't understand the distance parameters"
-        
-        # Now extract the location
-        if isinstance(actionParams, dict):
-            requestedDistanceString = actionParams["distance"]
-        else:
-            requestedDistanceString = ""
-
-        # Check if the requested distance is a valid number
-        try:
-            requestedDistance = float(requestedDistanceString)
-        except (ValueError, TypeError):
-            return False, "Doctor, I couldn't understand the distance parameters"
-
-        # Start animated catheter movement
-        self.start_catheter_movement(requestedDistance, "insert")
-        
-        return True, f"Doctor, we are inserting the catheter by {requestedDistance:.1f}mm"
-
+        return self._catheter_move(actionParams, "insert", "inserting")
 
     def catheter_retract_catheter(self, actionParams):
-        # Parse actionParams - it comes as a JSON string
-        if isinstance(actionParams, str) and actionParams:
-            try:
-                actionParams = json.loads(actionParams)
-            except json.JSONDecodeError:
-                return False, "Doctor, I couldn't understand the distance parameters"
-        
-        # Now extract the location
-        if isinstance(actionParams, dict):
-            requestedDistanceString = actionParams["distance"]
-        else:
-            requestedDistanceString = ""
+        return self._catheter_move(actionParams, "retract", "retracting")
+
+    def _catheter_move(self, actionParams, movementType, verb):
+        """Validate the requested distance and start moving the catheter ("insert" or "retract")."""
+        requestedDistanceString = actionParams.get("distance", "")
 
         # Check if the requested distance is a valid number
         try:
@@ -944,9 +1081,9 @@ class VentriculostomySim:
             return False, "Doctor, I couldn't understand the distance parameters"
 
         # Start animated catheter movement
-        self.start_catheter_movement(requestedDistance, "retract")
+        self.start_catheter_movement(requestedDistance, movementType)
         
-        return True, f"Doctor, we are retracting the catheter by {requestedDistance:.1f}mm"
+        return True, f"Doctor, we are {verb} the catheter by {requestedDistance:.1f}mm"
 
     def catheter_check_position(self):
         """Check if the catheter position is at the selected ventricle position.
@@ -956,73 +1093,49 @@ class VentriculostomySim:
                 - status: "at_target" if within tolerance, "need_further" if short, "overshot" if past target
                 - distance_info: distance in mm (negative if overshot, positive if need to go further)
         """
-        print("Checking catheter position")
+        logger.debug("Checking catheter position")
 
         # Check if the catheter position is at the selected ventricle position
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
-        intendedToolTransformNode = slicer.util.getFirstNodeByName("IntendedToolTransform")
+        toolTransformNode = self._getNode("ToolTransform")
+        intendedToolTransformNode = self._getNode("IntendedToolTransform")
         
         if not toolTransformNode or not intendedToolTransformNode:
             return "error", 0.0
         
-        # Get the catheter current position
-        transformMatrix = vtk.vtkMatrix4x4()
-        toolTransformNode.GetMatrixTransformToParent(transformMatrix)
-        catheterPosition = [
-            transformMatrix.GetElement(0, 3),
-            transformMatrix.GetElement(1, 3),
-            transformMatrix.GetElement(2, 3)
-        ]
-        
-        # Get the starting position (IntendedToolTransform)
-        intendedMatrix = vtk.vtkMatrix4x4()
-        intendedToolTransformNode.GetMatrixTransformToParent(intendedMatrix)
-        startPosition = [
-            intendedMatrix.GetElement(0, 3),
-            intendedMatrix.GetElement(1, 3),
-            intendedMatrix.GetElement(2, 3)
-        ]
-        
         # Check if selectedVentriclePosition exists
-        if not hasattr(self, 'selectedVentriclePosition') or self.selectedVentriclePosition is None:
-            print("No selected ventricle position")
+        targetPosition = self._selectedVentriclePositionArr
+        if targetPosition is None:
+            logger.warning("No selected ventricle position")
             return "error", 0.0
         
-        # Calculate distance from current position to target
-        distanceToTarget = (
-            (catheterPosition[0] - self.selectedVentriclePosition[0]) ** 2 +
-            (catheterPosition[1] - self.selectedVentriclePosition[1]) ** 2 +
-            (catheterPosition[2] - self.selectedVentriclePosition[2]) ** 2
-        ) ** 0.5
-        
-        # Calculate distance from start to target (total distance needed)
-        totalDistanceNeeded = (
-            (self.selectedVentriclePosition[0] - startPosition[0]) ** 2 +
-            (self.selectedVentriclePosition[1] - startPosition[1]) ** 2 +
-            (self.selectedVentriclePosition[2] - startPosition[2]) ** 2
-        ) ** 0.5
-        
-        # Calculate how far we've traveled from start
-        distanceTraveled = (
-            (catheterPosition[0] - startPosition[0]) ** 2 +
-            (catheterPosition[1] - startPosition[1]) ** 2 +
-            (catheterPosition[2] - startPosition[2]) ** 2
-        ) ** 0.5
-        
-        # Check if within tolerance (2.5mm)
+        # Get the catheter current position and the starting position (IntendedToolTransform)
+        catheterPosition = slicer.util.arrayFromTransformMatrix(toolTransformNode)[:3, 3]
+        startPosition = slicer.util.arrayFromTransformMatrix(intendedToolTransformNode)[:3, 3]
+        
+        # Check if within tolerance (2.5mm), comparing squared distances
         tolerance = 2.5
+        toTarget = catheterPosition - targetPosition
         
-        if distanceToTarget <= tolerance:
-            print("Catheter is at the target position")
+        if np.dot(toTarget, toTarget) <= tolerance * tolerance:
+            logger.debug("Catheter is at the target position")
             return "at_target", 0.0
-        elif distanceTraveled < totalDistanceNeeded:
+        
+        # Compare how far we've traveled from start with the distance from start to target (total distance needed)
+        traveled = catheterPosition - startPosition
+        needed = targetPosition - startPosition
+        distanceTraveledSq = np.dot(traveled, traveled)
+        totalDistanceNeededSq = np.dot(needed, needed)
+        
+        # The distances themselves are only needed for the message
+        distanceDifference = math.sqrt(totalDistanceNeededSq) - math.sqrt(distanceTraveledSq)
+        if distanceTraveledSq < totalDistanceNeededSq:
             # Need to go further - return positive distance
-            print("Catheter is not at the target position, we need to go further")
-            return "need_further", totalDistanceNeeded - distanceTraveled
+            logger.debug("Catheter is not at the target position, we need to go further")
+            return "need_further", distanceDifference
         else:
             # Have overshot - return negative distance
-            print("Catheter has overshot the target position")
-            return "overshot", -(distanceTraveled - totalDistanceNeeded)
+            logger.debug("Catheter has overshot the target position")
+            return "overshot", distanceDifference
 
 
     def catheter_drain(self, actionParams=None):
@@ -1035,14 +1148,12 @@ class VentriculostomySim:
             distance: Distance to move in mm (positive value)
             movementType: "insert" or "retract"
         """
-        import time
-        
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
+        toolTransformNode = self._toolTransformNode = self._getNode("ToolTransform")
         if not toolTransformNode:
             return
         
         # Get the current transformation matrix
-        transformMatrix = vtk.vtkMatrix4x4()
+        transformMatrix = self._toolMatrix
         toolTransformNode.GetMatrixTransformToParent(transformMatrix)
         
         # Extract the Z-axis direction (forward direction) from the rotation matrix
@@ -1059,6 +1170,9 @@ class VentriculostomySim:
             transformMatrix.GetElement(2, 3)
         ]
         
+        # Keep the starting pose so each tick only has to replace the translation
+        self._catheterPose = slicer.util.arrayFromVTKMatrix(transformMatrix)
+        
         # Set direction based on movement type
         if movementType == "retract":
             # Negative direction for retraction
@@ -1076,32 +1190,27 @@ class VentriculostomySim:
         self.moving = True
         
         # Store start time
-        self.catheterStartTime = time.time()
-        
-        # Create and start timer (update every 50ms for smooth animation)
-        if self.catheterTimer is None:
-            self.catheterTimer = qt.QTimer()
-            self.catheterTimer.timeout.connect(self.update_catheter_movement)
+        self.catheterStartTime = time.perf_counter()
         
-        self.catheterTimer.start(50)  # 50ms = 20 FPS
+        self.start_movement(self.update_catheter_movement)
         
-        print(f"Starting catheter {movementType} (distance: {distance:.2f} mm, speed: {self.catheterSpeed} mm/s)")
+        logger.debug("Starting catheter %s (distance: %.2f mm, speed: %s mm/s)", movementType, distance, self.catheterSpeed)
     
     def update_catheter_movement(self):
-        """Update the catheter position (called by timer)."""
-        import time
-        
+        """Update the catheter position (called by the tick timer)."""
         if not self.moving:
+            # Nothing is moving anymore, so don't keep ticking
+            self.stop_movement()
             return
         
         # Calculate elapsed time and distance traveled
-        elapsedTime = time.time() - self.catheterStartTime
+        elapsedTime = time.perf_counter() - self.catheterStartTime
         distanceTraveled = elapsedTime * self.catheterSpeed
         
         # Check if we've reached the end
         if distanceTraveled >= self.catheterTotalDistance:
             self.complete_catheter_movement()
-            
+            return
         
         # Calculate current position
         currentPosition = [
@@ -1111,31 +1220,27 @@ class VentriculostomySim:
         ]
         
         # Update ToolTransform position
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
+        toolTransformNode = self._toolTransformNode
         if toolTransformNode:
-            toolMatrix = vtk.vtkMatrix4x4()
-            toolTransformNode.GetMatrixTransformToParent(toolMatrix)
+            toolMatrix = self._toolMatrix
             
-            # Update position elements (translation)
-            toolMatrix.SetElement(0, 3, currentPosition[0])
-            toolMatrix.SetElement(1, 3, currentPosition[1])
-            toolMatrix.SetElement(2, 3, currentPosition[2])
+            # Update position elements (translation) and write the whole matrix at once
+            catheterPose = self._catheterPose
+            catheterPose[:3, 3] = currentPosition
+            toolMatrix.DeepCopy(catheterPose.ravel())
             
             toolTransformNode.SetMatrixTransformToParent(toolMatrix)
     
     def complete_catheter_movement(self):
         """Complete the catheter movement and notify."""
-        # Stop the timer
-        if self.catheterTimer:
-            self.catheterTimer.stop()
+        self.stop_movement()
 
-        print("Catheter movement complete")
+        logger.debug("Catheter movement complete")
         
         # Set the tool to the exact final position
-        toolTransformNode = slicer.util.getFirstNodeByName("ToolTransform")
+        toolTransformNode = self._toolTransformNode
         if toolTransformNode:
-            toolMatrix = vtk.vtkMatrix4x4()
-            toolTransformNode.GetMatrixTransformToParent(toolMatrix)
+            toolMatrix = self._toolMatrix
             
             # Calculate final position
             finalPosition = [
@@ -1145,9 +1250,9 @@ class VentriculostomySim:
             ]
             
             # Update position to exact final position
-            toolMatrix.SetElement(0, 3, finalPosition[0])
-            toolMatrix.SetElement(1, 3, finalPosition[1])
-            toolMatrix.SetElement(2, 3, finalPosition[2])
+            catheterPose = self._catheterPose
+            catheterPose[:3, 3] = finalPosition
+            toolMatrix.DeepCopy(catheterPose.ravel())
             
             toolTransformNode.SetMatrixTransformToParent(toolMatrix)
         